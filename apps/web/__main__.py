@@ -2,58 +2,44 @@
 """
 Entry point for running the Flask app as a module
 
-Creates and injects dependencies (Queue, Cache, Cloud providers) following
-the dependency injection pattern used by other services.
+Creates and injects dependencies (Cloud providers) following the dependency
+injection pattern used by other services.
 """
 
 import logging
 import sys
 from pathlib import Path
 
-# Set up logging before importing app
-try:
-    from alphafusion.utils.logging_config import setup_logging, get_logger
-    setup_logging(application="issuetracker", include_console=True)
-    logger = get_logger(__name__)
-except ImportError:
-    # Fallback if alphafusion-core not available
-    logging.basicConfig(level=logging.INFO)
-    logger = logging.getLogger(__name__)
+# Heavy imports (alphafusion-core, Flask app, Kafka client) are deferred to main()
+# so importing this module stays cheap
+logger = logging.getLogger(__name__)
 
-# Try to import degraded mode support (optional)
-try:
-    from alphafusion.config.degraded_mode import DegradedModeManager, ServiceState
-    from alphafusion.config.dependency_checker import DependencyChecker
-    DEGRADED_MODE_AVAILABLE = True
-except ImportError:
-    DEGRADED_MODE_AVAILABLE = False
-    logger.warning("Degraded mode support not available - service will fail if dependencies unavailable")
 
-from apps.web.app import create_app
+def _setup_logging():
+    """Configure centralized logging and return the module logger"""
+    try:
+        from alphafusion.utils.logging_config import setup_logging, get_logger
+        setup_logging(application="issuetracker", include_console=True)
+        return get_logger(__name__)
+    except ImportError:
+        # Fallback if alphafusion-core not available
+        logging.basicConfig(level=logging.INFO)
+        return logging.getLogger(__name__)
 
 
 def create_dependencies():
     """
-    Create Queue and Cloud provider dependencies.
+    Create the Cloud (Firebase) provider dependency.
+    
+    The Kafka queue consumer is not created here: IssueTrackerConsumer builds it
+    lazily right before subscribing, so the Kafka client is only imported once
+    the consumer actually starts.
     
     Returns:
-        tuple: (queue_consumer, firebase_provider)
+        FirebaseHelperProvider, or None if it could not be created
     """
-    queue_consumer = None
     firebase_provider = None
     
-    # Create Queue Consumer (for Kafka)
-    # Note: Kafka consumers are lazy - they only connect when subscribe() is called
-    try:
-        from alphafusion.storage.queue_factory import create_queue_consumer
-        queue_consumer = create_queue_consumer()
-        if queue_consumer:
-            logger.info("Queue consumer (Kafka) created successfully (will connect on subscribe)")
-        else:
-            logger.warning("Queue consumer creation returned None - Kafka may be unavailable")
-    except Exception as e:
-        logger.warning(f"Failed to create queue consumer: {e}. Kafka consumer will not be available.")
-    
     # Create Firebase provider
     try:
         from apps.web.utils.provider_factory import IssueTrackerProviderFactory
@@ -65,15 +51,29 @@ def create_dependencies():
     except Exception as e:
         logger.warning(f"Failed to create Firebase provider: {e}")
     
-    return queue_consumer, firebase_provider
+    return firebase_provider
 
 
 def main():
     """Main entry point - creates dependencies and starts Flask app"""
+    global logger
+    logger = _setup_logging()
+    
+    # Try to import degraded mode support (optional)
+    try:
+        from alphafusion.config.degraded_mode import DegradedModeManager
+        from alphafusion.config.dependency_checker import DependencyChecker
+        degraded_mode_available = True
+    except ImportError:
+        degraded_mode_available = False
+        logger.warning("Degraded mode support not available - service will fail if dependencies unavailable")
+    
+    from apps.web.app import create_app
+    
     degraded_mode_manager = None
     
     # Initialize degraded mode manager if available
-    if DEGRADED_MODE_AVAILABLE:
+    if degraded_mode_available:
         required_dependencies = ["cassandra"]  # Kafka is optional for issuetracker
         dependency_checker = DependencyChecker()
         degraded_mode_manager = DegradedModeManager(
@@ -95,13 +95,13 @@ def main():
         degraded_mode_manager.start_monitoring()
     
     # Create dependencies
-    queue_consumer, firebase_provider = create_dependencies()
+    firebase_provider = create_dependencies()
     
     # Create Flask app with injected dependencies
-    app = create_app(
-        queue_consumer=queue_consumer,
-        firebase_provider=firebase_provider
-    )
+    app = create_app(firebase_provider=firebase_provider)
+    
+    # Expose the background-refreshed dependency state to /api/health
+    app.degraded_mode_manager = degraded_mode_manager
     
     # Get port and debug settings
     port = app.config.get('FLASK_PORT', 6001)
@@ -115,6 +115,12 @@ def main():
     try:
         app.run(host='0.0.0.0', port=port, debug=debug)
     finally:
+        # Stop Kafka consumer on shutdown
+        try:
+            from apps.web.kafka_consumer import stop_consumer
+            stop_consumer()
+        except Exception as e:
+            logger.warning(f"Error stopping Kafka consumer: {e}")
         if degraded_mode_manager:
             degraded_mode_manager.stop_monitoring()
 
@@ -4,25 +4,66 @@ API endpoints for Issue Tracker (for service-to-service calls)
 """
 
 import logging
-from flask import Blueprint, request, jsonify
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from flask import Blueprint, request, jsonify, g, current_app
+from werkzeug.exceptions import HTTPException
 from apps.web.extensions import limiter
-from apps.web.utils.firebase_helper import FirebaseHelper
-from apps.web.models import Issue, Comment, IssueStatus, IssuePriority, IssueType, ActivityType, UserRole
-from apps.web.schemas import (
-    IssueCreateSchema, IssueUpdateSchema, CommentCreateSchema,
-    IssuePathSchema, validate_json_body, validate_path_params
-)
+from apps.web.models import Issue, Comment, IssueStatus, IssuePriority, IssueType, UserRole, enum_coercer
 
 logger = logging.getLogger(__name__)
 
 # Create API blueprint
 api_bp = Blueprint("api", __name__, url_prefix="/api")
 
+# Shared pool for side I/O that can overlap the main write of a request
+_IO_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="api-io")
 
-def _get_firebase_provider():
-    """Get Firebase provider from Flask app context"""
-    from flask import current_app
-    return getattr(current_app, 'firebase_helper_provider', None)
+# User IDs known to exist in Firebase (users are never deleted, so entries never go stale)
+_KNOWN_USERS_MAX = 10000
+_known_users = set()
+_known_users_lock = threading.Lock()
+
+
+# Updatable issue fields mapped to the function used to coerce their value (None = as-is)
+_UPDATE_COERCERS = {
+    "title": None,
+    "description": None,
+    "status": enum_coercer(IssueStatus),
+    "priority": enum_coercer(IssuePriority),
+    "type": enum_coercer(IssueType),
+    "assignee_id": None,
+    "tags": None,
+}
+
+
+@api_bp.before_request
+def _bind_providers():
+    """Resolve providers from the app once per request and cache them on flask.g"""
+    app = current_app._get_current_object()
+    g.firebase_provider = getattr(app, 'firebase_helper_provider', None)
+
+
+def http_error_json(e: HTTPException):
+    """JSON error response for an HTTP exception, keeping headers such as Allow (405) and Retry-After (429)"""
+    headers = [(name, value) for name, value in e.get_headers() if name.lower() != "content-type"]
+    return jsonify({"error": e.description}), e.code, headers
+
+
+@api_bp.errorhandler(ValueError)
+def _handle_value_error(e):
+    """Validation and coercion errors raised by handlers become 400 responses"""
+    return jsonify({"error": str(e)}), 400
+
+
+@api_bp.errorhandler(Exception)
+def _handle_unexpected_error(e):
+    """Log unexpected handler errors and return a generic 500 (HTTP errors become JSON with their own status)"""
+    if isinstance(e, HTTPException):
+        return http_error_json(e)
+    logger.error(f"Error handling {request.endpoint}: {e}", exc_info=True)
+    return jsonify({"error": "Internal server error"}), 500
 
 # Exempt entire API blueprint from CSRF protection
 # This must be done after csrf is initialized in app.py
@@ -31,10 +72,16 @@ def _get_firebase_provider():
 
 @api_bp.route("/health", methods=["GET"])
 def health_check():
-    """Health check endpoint"""
-    firebase_provider = _get_firebase_provider()
+    """
+    Health check endpoint.
+    
+    Reports the dependency state cached by the DegradedModeManager background
+    monitor (when running via __main__) instead of probing dependencies live.
+    """
+    firebase_provider = g.firebase_provider
+    degraded_mode_manager = getattr(current_app, 'degraded_mode_manager', None)
     return jsonify({
-        "status": "healthy",
+        "status": "degraded" if degraded_mode_manager and degraded_mode_manager.is_degraded() else "healthy",
         "firebase_available": firebase_provider.is_available() if firebase_provider else False
     }), 200
 
@@ -50,273 +97,271 @@ def create_issue():
     
     Returns a temporary ID that can be used to track the issue until it's processed.
     """
+    from apps.web.schemas import IssueCreateSchema, validate_json_body
+    
+    # Validate request body
+    data = validate_json_body(IssueCreateSchema, request.get_json() or {})
+    
+    # Auto-create service user if reporter doesn't exist (overlaps the publisher lookup)
+    firebase_provider = g.firebase_provider
+    reporter_id = data["reporter_id"]
+    user_futures = [_IO_POOL.submit(_ensure_service_user, firebase_provider, reporter_id)]
+    
+    # Auto-create service user for assignee if provided, distinct from the reporter and doesn't exist
+    if data.get("assignee_id") and data["assignee_id"] != reporter_id:
+        user_futures.append(_IO_POOL.submit(_ensure_service_user, firebase_provider, data["assignee_id"]))
+    
+    # Publish to Kafka (single source of truth for Firebase writes)
     try:
-        # Validate request body
-        data = validate_json_body(IssueCreateSchema, request.get_json() or {})
-        
-        # Auto-create service user if reporter doesn't exist (non-blocking)
-        reporter_id = data["reporter_id"]
-        _ensure_service_user(reporter_id)
+        from alphafusion.utils.issue_publisher import get_issue_publisher
+        publisher = get_issue_publisher()
         
-        # Auto-create service user for assignee if provided and doesn't exist
-        if data.get("assignee_id"):
-            _ensure_service_user(data["assignee_id"])
-        
-        # Publish to Kafka (single source of truth for Firebase writes)
-        try:
-            from alphafusion.utils.issue_publisher import get_issue_publisher
-            publisher = get_issue_publisher()
-            
-            if not publisher or not publisher.is_available():
-                return jsonify({
-                    "error": "Issue publishing service unavailable. Please try again later."
-                }), 503
-            
-            # Publish issue to Kafka
-            success = publisher.publish_issue(
-                title=data["title"],
-                description=data["description"],
-                type=data.get("type", "task"),
-                priority=data.get("priority", "medium"),
-                reporter_id=reporter_id,
-                assignee_id=data.get("assignee_id"),
-                tags=data.get("tags", []),
-                component=data.get("component", "api")
-            )
-            
-            if not success:
-                return jsonify({
-                    "error": "Failed to publish issue to Kafka. Please try again."
-                }), 503
-            
-            # Generate temporary ID (real ID will be generated by Firebase consumer)
-            import uuid
-            temp_id = f"temp-{uuid.uuid4().hex[:12]}"
-            
-            # Return temporary ID - client can poll for the real ID or check recent issues
+        if not publisher or not publisher.is_available():
             return jsonify({
-                "id": temp_id,
-                "title": data["title"],
-                "status": "open",
-                "priority": data.get("priority", "medium"),
-                "type": data.get("type", "task"),
-                "message": "Issue published successfully. It will be processed shortly.",
-                "note": "Use /api/v1/issues/{id} to check status once processed."
-            }), 202  # 202 Accepted - request accepted for processing
+                "error": "Issue publishing service unavailable. Please try again later."
+            }), 503
+        
+        # Referenced users must exist before the issue is published
+        for future in user_futures:
+            future.result()
+        
+        # Publish issue to Kafka
+        success = publisher.publish_issue(
+            title=data["title"],
+            description=data["description"],
+            type=data.get("type", "task"),
+            priority=data.get("priority", "medium"),
+            reporter_id=reporter_id,
+            assignee_id=data.get("assignee_id"),
+            tags=data.get("tags", []),
+            component=data.get("component", "api")
+        )
         
-        except ImportError as e:
-            logger.error(f"Failed to import issue publisher: {e}", exc_info=True)
+        if not success:
             return jsonify({
-                "error": "Issue publishing service not available"
+                "error": "Failed to publish issue to Kafka. Please try again."
             }), 503
-        except Exception as e:
-            logger.error(f"Error publishing issue to Kafka: {e}", exc_info=True)
-            return jsonify({
-                "error": "Failed to publish issue. Please try again."
-            }), 500
+        
+        # Generate temporary ID (real ID will be generated by Firebase consumer)
+        import uuid
+        temp_id = f"temp-{uuid.uuid4().hex[:12]}"
+        
+        # Return temporary ID - client can poll for the real ID or check recent issues
+        return jsonify({
+            "id": temp_id,
+            "title": data["title"],
+            "status": "open",
+            "priority": data.get("priority", "medium"),
+            "type": data.get("type", "task"),
+            "message": "Issue published successfully. It will be processed shortly.",
+            "note": "Use /api/v1/issues/{id} to check status once processed."
+        }), 202  # 202 Accepted - request accepted for processing
     
-    except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+    except ImportError as e:
+        logger.error(f"Failed to import issue publisher: {e}", exc_info=True)
+        return jsonify({
+            "error": "Issue publishing service not available"
+        }), 503
     except Exception as e:
-        logger.error(f"Error creating issue: {e}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+        logger.error(f"Error publishing issue to Kafka: {e}", exc_info=True)
+        return jsonify({
+            "error": "Failed to publish issue. Please try again."
+        }), 500
 
 
 @api_bp.route("/v1/issues/<issue_id>", methods=["GET"])
 @limiter.limit("200 per minute")
 def get_issue(issue_id: str):
     """Get issue by ID"""
-    try:
-        # Validate path parameter
-        validate_path_params(IssuePathSchema, {"issue_id": issue_id})
-        
-        firebase_provider = _get_firebase_provider()
-        if not firebase_provider:
-            return jsonify({"error": "Firebase provider not available"}), 503
-        
-        issue = firebase_provider.get_issue(issue_id)
-        
-        if not issue:
-            return jsonify({"error": "Issue not found"}), 404
-        
-        # Convert to dict
-        issue_dict = issue.to_dict()
-        issue_dict["id"] = issue.id
-        
-        return jsonify(issue_dict), 200
+    from apps.web.schemas import IssuePathSchema, validate_path_params
     
-    except ValueError as e:
-        return jsonify({"error": str(e)}), 400
-    except Exception as e:
-        logger.error(f"Error getting issue: {e}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+    # Validate path parameter
+    validate_path_params(IssuePathSchema, {"issue_id": issue_id})
+    
+    firebase_provider = g.firebase_provider
+    if not firebase_provider:
+        return jsonify({"error": "Firebase provider not available"}), 503
+    
+    issue = firebase_provider.get_issue(issue_id)
+    
+    if not issue:
+        return jsonify({"error": "Issue not found"}), 404
+    
+    # Convert to response dict (includes ID)
+    return jsonify(issue.as_response_dict()), 200
 
 
 @api_bp.route("/v1/issues/<issue_id>", methods=["PATCH"])
 @limiter.limit("100 per minute")
 def update_issue(issue_id: str):
     """Update an issue"""
-    try:
-        # Validate path parameter
-        validate_path_params(IssuePathSchema, {"issue_id": issue_id})
-        
-        # Validate request body
-        data = validate_json_body(IssueUpdateSchema, request.get_json() or {})
-        
-        # Get provider from app context
-        firebase_provider = _get_firebase_provider()
-        
-        if not firebase_provider:
-            return jsonify({"error": "Firebase provider not available"}), 503
-        
-        # Get current issue
-        issue = firebase_provider.get_issue(issue_id)
-        if not issue:
-            return jsonify({"error": "Issue not found"}), 404
-        
-        # Prepare changes
-        changes = {}
-        if "title" in data:
-            changes["title"] = data["title"]
-        if "description" in data:
-            changes["description"] = data["description"]
-        if "status" in data:
-            changes["status"] = IssueStatus(data["status"])
-        if "priority" in data:
-            changes["priority"] = IssuePriority(data["priority"])
-        if "type" in data:
-            changes["type"] = IssueType(data["type"])
-        if "assignee_id" in data:
-            changes["assignee_id"] = data["assignee_id"]
-        if "tags" in data:
-            changes["tags"] = data["tags"]
-        
-        # Use reporter_id as user_id for activity log (or get from request if available)
-        user_id = request.headers.get("X-User-Id") or issue.reporter_id
-        
-        # Update issue
-        success = firebase_provider.update_issue(issue_id, changes, user_id)
-        
-        if not success:
-            return jsonify({"error": "Failed to update issue"}), 500
-        
-        # Get updated issue
+    from apps.web.schemas import IssuePathSchema, IssueUpdateSchema, validate_json_body, validate_path_params
+    
+    # Validate path parameter
+    validate_path_params(IssuePathSchema, {"issue_id": issue_id})
+    
+    # Validate request body
+    data = validate_json_body(IssueUpdateSchema, request.get_json() or {})
+    
+    # Get provider from app context
+    firebase_provider = g.firebase_provider
+    
+    if not firebase_provider:
+        return jsonify({"error": "Firebase provider not available"}), 503
+    
+    # Get current issue
+    issue = firebase_provider.get_issue(issue_id)
+    if not issue:
+        return jsonify({"error": "Issue not found"}), 404
+    
+    # Prepare changes
+    changes = {
+        field_name: coerce(data[field_name]) if coerce else data[field_name]
+        for field_name, coerce in _UPDATE_COERCERS.items()
+        if field_name in data
+    }
+    
+    # Use reporter_id as user_id for activity log (or get from request if available)
+    user_id = request.headers.get("X-User-Id") or issue.reporter_id
+    
+    # Update issue
+    success = firebase_provider.update_issue(issue_id, changes, user_id)
+    
+    if not success:
+        return jsonify({"error": "Failed to update issue"}), 500
+    
+    if "status" in changes:
+        # Status changes move issues between the dashboard counts
+        from apps.web.routes import invalidate_issue_counts
+        invalidate_issue_counts()
+    
+    if current_app.config.get("VERIFY_WRITES"):
+        # Re-read to confirm the write landed (debug only - costs a Firestore round-trip)
         updated_issue = firebase_provider.get_issue(issue_id)
         if not updated_issue:
             return jsonify({"error": "Issue updated but not found"}), 500
-        
-        issue_dict = updated_issue.to_dict()
-        issue_dict["id"] = updated_issue.id
-        
-        return jsonify(issue_dict), 200
+    else:
+        updated_issue = _apply_changes(issue, changes)
     
-    except ValueError as e:
-        return jsonify({"error": str(e)}), 400
-    except Exception as e:
-        logger.error(f"Error updating issue: {e}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+    return jsonify(updated_issue.as_response_dict()), 200
 
 
 @api_bp.route("/v1/issues/<issue_id>/comments", methods=["POST"])
 @limiter.limit("100 per minute")
 def create_comment(issue_id: str):
     """Create a comment on an issue"""
-    try:
-        # Validate path parameter
-        validate_path_params(IssuePathSchema, {"issue_id": issue_id})
-        
-        # Validate request body
-        data = validate_json_body(CommentCreateSchema, request.get_json() or {})
-        
-        # Get provider from app context
-        firebase_provider = _get_firebase_provider()
-        
-        if not firebase_provider:
-            return jsonify({"error": "Firebase provider not available"}), 503
-        
-        # Check if issue exists
-        issue = firebase_provider.get_issue(issue_id)
-        if not issue:
-            return jsonify({"error": "Issue not found"}), 404
-        
-        # Auto-create service user if author doesn't exist
-        author_id = data["author_id"]
-        _ensure_service_user(author_id)
-        
-        # Create comment
-        comment = Comment(
-            author_id=author_id,
-            content=data["content"]
-        )
-        
-        comment_id = firebase_provider.create_comment(issue_id, comment)
-        
-        if not comment_id:
-            return jsonify({"error": "Failed to create comment"}), 500
-        
-        # Get created comment
-        comments = firebase_provider.get_comments(issue_id)
-        created_comment = next((c for c in comments if c.id == comment_id), None)
-        
+    from apps.web.schemas import IssuePathSchema, CommentCreateSchema, validate_json_body, validate_path_params
+    
+    # Validate path parameter
+    validate_path_params(IssuePathSchema, {"issue_id": issue_id})
+    
+    # Validate request body
+    data = validate_json_body(CommentCreateSchema, request.get_json() or {})
+    
+    # Get provider from app context
+    firebase_provider = g.firebase_provider
+    
+    if not firebase_provider:
+        return jsonify({"error": "Firebase provider not available"}), 503
+    
+    # Auto-create service user if author doesn't exist (overlaps the issue lookup)
+    author_id = data["author_id"]
+    author_future = _IO_POOL.submit(_ensure_service_user, firebase_provider, author_id)
+    
+    # Check if issue exists
+    issue = firebase_provider.get_issue(issue_id)
+    if not issue:
+        return jsonify({"error": "Issue not found"}), 404
+    
+    # The author must exist before the comment referencing it is written
+    author_future.result()
+    
+    # Create comment
+    comment = Comment(
+        author_id=author_id,
+        content=data["content"]
+    )
+    
+    comment_id = firebase_provider.create_comment(issue_id, comment)
+    
+    if not comment_id:
+        return jsonify({"error": "Failed to create comment"}), 500
+    
+    # create_comment populates id, issue_id and timestamps on the passed-in comment
+    comment.id = comment_id
+    created_comment = comment
+    if current_app.config.get("VERIFY_WRITES"):
+        created_comment = firebase_provider.get_comment(issue_id, comment_id)
         if not created_comment:
             return jsonify({"error": "Comment created but not found"}), 500
-        
-        comment_dict = created_comment.to_dict()
-        comment_dict["id"] = created_comment.id
-        
-        return jsonify(comment_dict), 201
     
-    except ValueError as e:
-        return jsonify({"error": str(e)}), 400
-    except Exception as e:
-        logger.error(f"Error creating comment: {e}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+    return jsonify(created_comment.as_response_dict()), 201
 
 
 @api_bp.route("/v1/issues/<issue_id>/comments", methods=["GET"])
 @limiter.limit("200 per minute")
 def get_comments(issue_id: str):
     """Get all comments for an issue"""
-    try:
-        # Validate path parameter
-        validate_path_params(IssuePathSchema, {"issue_id": issue_id})
-        
-        # Get provider from app context
-        firebase_provider = _get_firebase_provider()
-        if not firebase_provider:
-            return jsonify({"error": "Firebase provider not available"}), 503
-        
-        # Check if issue exists
-        issue = firebase_provider.get_issue(issue_id)
-        if not issue:
-            return jsonify({"error": "Issue not found"}), 404
-        
-        # Get comments
-        comments = firebase_provider.get_comments(issue_id)
-        
-        comments_list = []
-        for comment in comments:
-            comment_dict = comment.to_dict()
-            comment_dict["id"] = comment.id
-            comments_list.append(comment_dict)
-        
-        return jsonify({"comments": comments_list}), 200
+    from apps.web.schemas import IssuePathSchema, validate_path_params
     
-    except ValueError as e:
-        return jsonify({"error": str(e)}), 400
-    except Exception as e:
-        logger.error(f"Error getting comments: {e}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+    # Validate path parameter
+    validate_path_params(IssuePathSchema, {"issue_id": issue_id})
+    
+    # Get provider from app context
+    firebase_provider = g.firebase_provider
+    if not firebase_provider:
+        return jsonify({"error": "Firebase provider not available"}), 503
+    
+    # Check if issue exists
+    issue = firebase_provider.get_issue(issue_id)
+    if not issue:
+        return jsonify({"error": "Issue not found"}), 404
+    
+    # Get comments
+    comments = firebase_provider.get_comments(issue_id)
+    
+    return jsonify({"comments": [comment.as_response_dict() for comment in comments]}), 200
 
 
-def _ensure_service_user(user_id: str):
+def _apply_changes(issue: Issue, changes: dict) -> Issue:
+    """
+    Apply a successful update to the locally held issue.
+    Mirrors the fields FirebaseHelper.update_issue writes so the response
+    can be built without re-reading the document.
+    """
+    changed = {
+        field_name: value for field_name, value in changes.items()
+        if getattr(issue, field_name) != value
+    }
+    if not changed:
+        return issue  # No changes
+    
+    now = datetime.now()
+    old_status = issue.status
+    for field_name, value in changed.items():
+        setattr(issue, field_name, value)
+    issue.updated_at = now
+    if "status" in changed:
+        if changed["status"] == IssueStatus.RESOLVED:
+            issue.resolved_at = now
+        elif old_status == IssueStatus.RESOLVED:
+            issue.resolved_at = None
+    return issue
+
+
+def _ensure_service_user(firebase_provider, user_id: str):
     """
     Ensure a service user exists in Firebase.
     Creates the user with SERVICE role if it doesn't exist.
     Non-blocking - logs warning but doesn't raise exception.
+    
+    Runs on _IO_POOL, so the provider is passed in rather than read from flask.g.
+    Users already seen are remembered in-process so repeat calls skip the Firestore read.
     """
+    if user_id in _known_users:
+        return
+    
     try:
-        firebase_provider = _get_firebase_provider()
         if not firebase_provider:
             logger.warning("Firebase provider not available, cannot ensure service user")
             return
@@ -324,6 +369,7 @@ def _ensure_service_user(user_id: str):
         # Check if user exists
         user = firebase_provider.get_user(user_id)
         if user:
+            _remember_user(user_id)
             return  # User already exists
         
         # Create service user
@@ -338,6 +384,7 @@ def _ensure_service_user(user_id: str):
         )
         
         if created_user:
+            _remember_user(user_id)
             logger.info(f"Auto-created service user: {user_id} with SERVICE role")
         else:
             logger.warning(f"Failed to auto-create service user: {user_id}")
@@ -346,3 +393,10 @@ def _ensure_service_user(user_id: str):
         # Non-blocking - log warning but don't fail the request
         logger.warning(f"Error ensuring service user exists ({user_id}): {e}")
 
+
+def _remember_user(user_id: str):
+    """Record a user ID as existing, resetting the cache once it grows past its bound"""
+    with _known_users_lock:
+        if len(_known_users) >= _KNOWN_USERS_MAX:
+            _known_users.clear()
+        _known_users.add(user_id)
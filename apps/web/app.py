@@ -6,7 +6,7 @@ Main Flask Application for Issue Tracker
 import os
 import sys
 import logging
-import uuid
+import secrets
 from pathlib import Path
 from datetime import timedelta
 
@@ -21,11 +21,13 @@ except ImportError:
     logger = logging.getLogger(__name__)
 
 try:
-    from flask import Flask, request, g
-    from apps.web.extensions import csrf, talisman, limiter
-    from apps.web.routes import register_routes
-    from apps.web.auth import ensure_default_admin
+    from flask import Flask, request, g, render_template
+    from jinja2 import FileSystemBytecodeCache
+    from werkzeug.exceptions import HTTPException
+    from apps.web.extensions import csrf, limiter, init_static_security_headers
     
+    # Routes, auth, OAuth, API and Kafka modules are imported inside the functions
+    # that use them so importing this module stays cheap
     logger.info("All Flask dependencies imported successfully")
 except ImportError as e:
     logger.error(f"Failed to import Flask dependencies: {e}", exc_info=True)
@@ -34,6 +36,18 @@ except ImportError as e:
     raise
 
 
+# Application directory for templates and static files
+_APP_DIR = Path(__file__).parent
+_TEMPLATES_DIR = str(_APP_DIR / 'templates')
+_STATIC_DIR = str(_APP_DIR / 'static')
+
+# Status codes with a custom error page: status -> (JSON error message, template)
+_ERROR_PAGES = {
+    404: ('Not found', '404.html'),
+    500: ('An internal error occurred', '500.html'),
+}
+
+
 def create_app(queue_consumer=None, firebase_provider=None):
     """
     Create and configure Flask application.
@@ -45,15 +59,10 @@ def create_app(queue_consumer=None, firebase_provider=None):
     Returns:
         Configured Flask application
     """
-    # Get application directory for templates and static files
-    app_dir = Path(__file__).parent
-    templates_dir = app_dir / 'templates'
-    static_dir = app_dir / 'static'
-    
     app = Flask(
         __name__,
-        template_folder=str(templates_dir),
-        static_folder=str(static_dir)
+        template_folder=_TEMPLATES_DIR,
+        static_folder=_STATIC_DIR
     )
     
     # 1. Configure App
@@ -77,6 +86,7 @@ def create_app(queue_consumer=None, firebase_provider=None):
     # This must happen after providers are ready so FirebaseClient can initialize properly
     with app.app_context():
         try:
+            from apps.web.auth import ensure_default_admin
             ensure_default_admin()
         except Exception as e:
             logger.debug(f"Default admin creation skipped: {e}")
@@ -92,7 +102,8 @@ def create_app(queue_consumer=None, firebase_provider=None):
         from apps.web.kafka_consumer import start_consumer
         start_consumer(
             queue_consumer=queue_consumer,
-            firebase_provider=firebase_provider
+            firebase_provider=firebase_provider,
+            num_workers=app.config['KAFKA_CONSUMER_WORKERS']
         )
         logger.info("Kafka consumer started for issue tracking")
     except Exception as e:
@@ -101,13 +112,40 @@ def create_app(queue_consumer=None, firebase_provider=None):
     return app
 
 
+# SecureConfigLoader values already loaded, by (path, kwargs)
+_config_cache = {}
+
+
+def _get_config_value(path, **kwargs):
+    """
+    Memoized SecureConfigLoader lookup.
+    Config values are fixed for the life of the process, so repeated create_app
+    calls (tests, reloads, multiple app instances) don't go back to the config store.
+    Empty results and errors are not cached, so a briefly unavailable store is retried.
+    """
+    key = (path, tuple(sorted(kwargs.items())))
+    if key in _config_cache:
+        return _config_cache[key]
+    
+    from alphafusion.config.config_helper import get_config_value
+    value = get_config_value(path, **kwargs)
+    if value is not None and value != "":
+        _config_cache[key] = value
+    return value
+
+
+def _as_bool(value) -> bool:
+    """Interpret a config flag (the config store may return strings such as "False")"""
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
 def configure_app(app):
     """Configure Flask application"""
     # Secret Key - MUST be loaded from SecureConfigLoader
     try:
-        from alphafusion.config.config_helper import get_config_value
-        
-        secret_key = get_config_value("app/issuetracker/secret_key")
+        secret_key = _get_config_value("app/issuetracker/secret_key")
         
         if not secret_key:
             # Fallback for development
@@ -128,17 +166,48 @@ def configure_app(app):
     
     # Flask configuration
     try:
-        from alphafusion.config.config_helper import get_config_value
-        
-        app.config['FLASK_DEBUG'] = get_config_value("app/issuetracker/flask_debug", default=False)
-        app.config['FLASK_PORT'] = int(get_config_value("app/issuetracker/flask_port", default=6001))
+        app.config['FLASK_DEBUG'] = _as_bool(_get_config_value("app/issuetracker/flask_debug", default=False))
+        app.config['FLASK_PORT'] = int(_get_config_value("app/issuetracker/flask_port", default=6001))
     except Exception:
         app.config['FLASK_DEBUG'] = os.getenv("FLASK_DEBUG", "False").lower() == "true"
         app.config['FLASK_PORT'] = int(os.getenv("FLASK_PORT", "6001"))
     
+    # Templates: only stat template files for changes in debug, and keep compiled template bytecode
+    # on disk so fresh workers skip the parse/compile step (default dir is Jinja's per-user temp dir)
+    app.config['TEMPLATES_AUTO_RELOAD'] = app.config['FLASK_DEBUG']
+    # Strip the newline/indentation around block tags when templates are compiled, so the markup
+    # whitespace from {% if %}/{% for %} is not re-emitted on every render. Set before the bytecode
+    # cache is attached; the cache key ignores these options, hence the distinct file pattern.
+    app.jinja_env.trim_blocks = True
+    app.jinja_env.lstrip_blocks = True
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(
+        os.getenv("JINJA_BYTECODE_CACHE_DIR") or None, pattern="__jinja2_trim_%s.cache"
+    )
+    
+    # Serialize JSON responses with orjson when it is installed (same output format as the stdlib provider)
+    from apps.web.utils.json_provider import OrjsonProvider, ORJSON_AVAILABLE
+    if ORJSON_AVAILABLE:
+        app.json = OrjsonProvider(app)
+    
+    # Re-read documents after writes to confirm them (debug only - adds a Firestore round-trip)
+    app.config['VERIFY_WRITES'] = os.getenv("VERIFY_WRITES", "False").lower() == "true"
+    
+    # Kafka issue consumer threads - more than the issues topic's partition count just idle
+    app.config['KAFKA_CONSUMER_WORKERS'] = int(os.getenv("KAFKA_CONSUMER_WORKERS", "1"))
+    
+    # Rate limit storage: defaults to per-process memory; point at a shared backend
+    # (e.g. redis://host:6379) so limits are enforced across all workers
+    app.config['RATELIMIT_STORAGE_URI'] = os.getenv("RATELIMIT_STORAGE_URI", "memory://")
+    app.config['RATELIMIT_STRATEGY'] = os.getenv("RATELIMIT_STRATEGY", "fixed-window")
+    
     # Session configuration
     app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(hours=24)
-    app.config['SESSION_COOKIE_SECURE'] = os.getenv("SESSION_COOKIE_SECURE", "False").lower() == "true"
+    # Secure cookies outside debug (as Talisman did) unless SESSION_COOKIE_SECURE is set explicitly
+    secure_cookie = os.getenv("SESSION_COOKIE_SECURE")
+    if secure_cookie is not None:
+        app.config['SESSION_COOKIE_SECURE'] = secure_cookie.lower() == "true"
+    else:
+        app.config['SESSION_COOKIE_SECURE'] = not app.config['FLASK_DEBUG']
     app.config['SESSION_COOKIE_HTTPONLY'] = True
     app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 
@@ -148,13 +217,11 @@ def init_extensions(app):
     # CSRF Protection
     csrf.init_app(app)
     
-    # Security Headers (Talisman)
-    talisman.init_app(
-        app,
-        force_https=False,  # Set to True in production with HTTPS
-        strict_transport_security=False,  # Set to True in production
-        content_security_policy=None  # Can be configured for production
-    )
+    # Security Headers
+    # HTTPS redirects, HSTS and CSP are off, so Talisman's headers are constant and are set
+    # directly. For production HTTPS switch back to:
+    #   talisman.init_app(app, force_https=True, strict_transport_security=True, content_security_policy=...)
+    init_static_security_headers(app)
     
     # Rate Limiting
     limiter.init_app(app)
@@ -195,67 +262,60 @@ def init_providers(app):
 def register_blueprints(app):
     """Register Flask blueprints"""
     # Register web routes
+    from apps.web.routes import register_routes
     register_routes(app)
     
     # Register API blueprint (for service-to-service calls)
     from apps.web.api import api_bp
-    logger.info(f"Registering API blueprint: {api_bp.name} with URL prefix: {api_bp.url_prefix}")
     app.register_blueprint(api_bp)
-    logger.info(f"API blueprint registered successfully. Blueprints: {list(app.blueprints.keys())}")
     
     # Exempt API blueprint from CSRF protection (for service-to-service calls)
     # This must be done after csrf.init_app() is called (which happens in init_extensions)
-    from apps.web.extensions import csrf
     csrf.exempt(api_bp)
-    logger.info("API blueprint exempted from CSRF protection")
+    logger.info(f"API blueprint '{api_bp.name}' registered at {api_bp.url_prefix} (CSRF exempt)")
 
 
 def register_error_handlers(app):
     """Register error handlers"""
-    @app.errorhandler(404)
-    def not_found(error):
-        if request.is_json:
-            return {'error': 'Not found'}, 404
-        from flask import render_template
-        return render_template('404.html'), 404
+    from apps.web.auth import wants_json
+    from apps.web.api import http_error_json
     
-    @app.errorhandler(500)
-    def internal_error(error):
-        error_id = str(uuid.uuid4())
+    def error_response(status, log_message=None):
+        """Build a JSON (API/JSON requests) or rendered-page error response, logging under an error ID if asked"""
+        message, template = _ERROR_PAGES[status]
+        if not log_message:
+            if wants_json():
+                return {'error': message}, status
+            return render_template(template), status
+        
+        error_id = secrets.token_hex(8)
         app.logger.exception(
-            "Internal server error",
+            log_message,
             extra={'error_id': error_id, 'endpoint': request.endpoint, 'method': request.method, 'path': request.path}
         )
-        if request.is_json or request.path.startswith("/api/"):
-            return {'error': 'An internal error occurred', 'error_id': error_id}, 500
-        from flask import render_template
-        return render_template('500.html', error_id=error_id), 500
+        if wants_json():
+            return {'error': message, 'error_id': error_id}, status
+        return render_template(template, error_id=error_id), status
+    
+    # Compile the error pages up front so the first error doesn't pay for template loading.
+    # They can't be pre-rendered: base.html embeds a per-session CSRF token and user info.
+    for _, template in _ERROR_PAGES.values():
+        app.jinja_env.get_template(template)
+    
+    @app.errorhandler(HTTPException)
+    def handle_http_exception(e):
+        # HTTP errors without a custom page (405, 429, ...) keep werkzeug's default response,
+        # except for API/JSON requests, which get the description as JSON
+        if e.code not in _ERROR_PAGES:
+            return http_error_json(e) if wants_json() else e
+        return error_response(e.code, log_message="Internal server error" if e.code == 500 else None)
     
     @app.errorhandler(Exception)
     def handle_exception(e):
-        error_id = str(uuid.uuid4())
-        app.logger.exception(
-            "Unhandled exception",
-            extra={'error_id': error_id, 'endpoint': request.endpoint, 'method': request.method, 'path': request.path}
-        )
-        if request.is_json or request.path.startswith("/api/"):
-            return {'error': 'An internal error occurred', 'error_id': error_id}, 500
-        from flask import render_template
-        return render_template('500.html', error_id=error_id), 500
+        return error_response(500, log_message="Unhandled exception")
 
 
 if __name__ == "__main__":
-    app = create_app()
-    port = app.config.get('FLASK_PORT', 6001)
-    debug = app.config.get('FLASK_DEBUG', False)
-    
-    try:
-        app.run(host='0.0.0.0', port=port, debug=debug)
-    finally:
-        # Stop Kafka consumer on shutdown
-        try:
-            from apps.web.kafka_consumer import stop_consumer
-            stop_consumer()
-        except Exception as e:
-            logger.warning(f"Error stopping Kafka consumer: {e}")
-
+    # Single startup path: dependency wiring lives in apps.web.__main__
+    from apps.web.__main__ import main
+    main()
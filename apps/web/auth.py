@@ -4,23 +4,60 @@ Authentication and authorization for Issue Tracker
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 from typing import Optional
-from flask import session, redirect, url_for, request, jsonify, current_app, flash
+from flask import session, redirect, url_for, request, jsonify, current_app, flash, g, has_app_context
+from werkzeug.routing import BuildError
 from apps.web.models import UserRole
 from apps.web.oauth import is_quantory_email
 
 logger = logging.getLogger(__name__)
 
+# Requests under this prefix get JSON errors instead of redirects/HTML pages
+_API_PREFIX = "/api/"
+
+# Background pool for login bookkeeping writes that don't affect the response
+_LOGIN_UPDATE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="login-update")
+
+# app.extensions key set once an admin user is known to exist, so repeat calls for that app skip the check
+_ADMIN_ENSURED_KEY = "issuetracker_admin_ensured"
+
 
 def _get_firebase_provider():
     """Get Firebase provider from Flask app context"""
     return getattr(current_app, 'firebase_helper_provider', None)
 
 
+def wants_json():
+    """Check whether the current request expects a JSON (rather than HTML) response"""
+    return request.is_json or request.path.startswith(_API_PREFIX)
+
+
+def _landing_url():
+    """
+    URL of the landing page, built once per app.
+    The endpoint takes no arguments, so url_for() would return the same string on every call.
+    """
+    app = current_app._get_current_object()
+    url = getattr(app, 'landing_url', None)
+    if url is None:
+        try:
+            url = url_for("landing")
+        except BuildError as e:
+            # Web routes not registered on this app - fall back to the site root (logged once per app)
+            logger.error(f"Cannot build landing page URL, redirecting to '/': {e}")
+            url = "/"
+        app.landing_url = url
+    return url
+
+
 def get_current_user_id():
     """Get current user ID from session"""
-    return session.get("user_id")
+    # Cached on flask.g so stacked decorators and handlers share one session read per request
+    if "current_user_id" not in g:
+        g.current_user_id = session.get("user_id")
+    return g.current_user_id
 
 
 def get_current_user():
@@ -42,21 +79,21 @@ def require_auth(f):
     def decorated_function(*args, **kwargs):
         user_id = get_current_user_id()
         if not user_id:
-            if request.is_json or request.path.startswith("/api/"):
+            if wants_json():
                 return jsonify({"error": "Authentication required"}), 401
             # Store original URL for redirect after login
             if request.path not in ['/landing', '/login', '/oauth/callback', '/logout']:
                 session['oauth_redirect'] = request.url
-            return redirect(url_for("landing"))
+            return redirect(_landing_url())
         
         # Verify user is from @quantory.app domain
         if not is_quantory_email(user_id):
             logger.warning(f"Access denied for non-quantory.app user: {user_id}")
-            if request.is_json or request.path.startswith("/api/"):
+            if wants_json():
                 return jsonify({"error": "Access denied. Only @quantory.app users are allowed."}), 403
             flash("Access denied. Only @quantory.app users are allowed.", "error")
             logout_user()
-            return redirect(url_for("landing"))
+            return redirect(_landing_url())
         
         return f(*args, **kwargs)
     return decorated_function
@@ -64,21 +101,23 @@ def require_auth(f):
 
 def require_role(*roles):
     """Decorator to require specific role(s)"""
+    allowed_roles = frozenset(roles)
+    
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             user = get_current_user()
             if not user:
-                if request.is_json or request.path.startswith("/api/"):
+                if wants_json():
                     return jsonify({"error": "Authentication required"}), 401
                 # Store original URL for redirect after login
                 if request.path not in ['/landing', '/login', '/oauth/callback', '/logout']:
                     session['oauth_redirect'] = request.url
-                return redirect(url_for("landing"))
+                return redirect(_landing_url())
             
-            user_role = UserRole(user.role.value if hasattr(user.role, 'value') else user.role)
-            if user_role not in roles:
-                if request.is_json or request.path.startswith("/api/"):
+            user_role = user.role if isinstance(user.role, UserRole) else UserRole(user.role)
+            if user_role not in allowed_roles:
+                if wants_json():
                     return jsonify({"error": "Insufficient permissions"}), 403
                 return jsonify({"error": "Insufficient permissions"}), 403
             
@@ -90,27 +129,33 @@ def require_role(*roles):
 def login_user(user_id: str, display_name: Optional[str] = None):
     """Log in a user"""
     session["user_id"] = user_id
+    g.current_user_id = user_id
     if display_name:
         session["user_display_name"] = display_name
-    # Update last login
+    # Update last login in the background (fire-and-forget - the login doesn't wait on Firestore)
     firebase_provider = _get_firebase_provider()
     if firebase_provider:
-        firebase_provider.update_user(user_id, last_login=None)  # Will be set to now in update_user
+        _LOGIN_UPDATE_POOL.submit(firebase_provider.update_user, user_id, last_login=None)  # Will be set to now in update_user
 
 
 def logout_user():
     """Log out current user"""
     session.pop("user_id", None)
+    g.current_user_id = None
 
 
 def ensure_default_admin():
-    """Ensure default admin user exists"""
+    """Ensure default admin user exists (checked once per app)"""
+    app = current_app._get_current_object() if has_app_context() else None
+    if app is not None and app.extensions.get(_ADMIN_ENSURED_KEY):
+        return
+    
     try:
         # Try to get provider from app context if available
         # If not available (e.g., during app initialization), create temporary instance
-        try:
+        if app is not None:
             firebase_provider = _get_firebase_provider()
-        except RuntimeError:
+        else:
             # App context not available, create temporary provider
             from apps.web.utils.provider_factory import IssueTrackerProviderFactory
             firebase_provider = IssueTrackerProviderFactory.create_firebase_helper_provider()
@@ -119,11 +164,16 @@ def ensure_default_admin():
             logger.warning("Firebase not available, cannot create default admin")
             return
         
-        # Check if any admin exists
-        users = firebase_provider.list_users()
-        has_admin = any(user.role == UserRole.ADMIN for user in users)
+        # Check if any admin exists: probe the default admin directly, then query for a single admin
+        default_admin = firebase_provider.get_user("admin")
+        has_admin = (
+            (default_admin is not None and default_admin.role == UserRole.ADMIN)
+            or bool(firebase_provider.list_users(role=UserRole.ADMIN, limit=1))
+        )
         
-        if not has_admin:
+        if has_admin:
+            _mark_admin_ensured(app)
+        else:
             # Create default admin
             default_admin = firebase_provider.create_user(
                 uid="admin",
@@ -132,9 +182,16 @@ def ensure_default_admin():
                 role=UserRole.ADMIN
             )
             if default_admin:
+                _mark_admin_ensured(app)
                 logger.info("Created default admin user (uid: admin, email: admin@alphafusion.local)")
             else:
                 logger.error("Failed to create default admin user")
     except Exception as e:
         logger.debug(f"Default admin creation skipped: {e}")
 
+
+
+def _mark_admin_ensured(app):
+    """Remember on the app that an admin exists (no-op outside an app context)"""
+    if app is not None:
+        app.extensions[_ADMIN_ENSURED_KEY] = True
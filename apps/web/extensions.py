@@ -19,3 +19,28 @@ csrf = CSRFProtect()
 talisman = Talisman()
 limiter = Limiter(key_func=get_remote_address)
 
+
+
+# Headers Talisman sends when HTTPS redirects, HSTS and CSP are all disabled
+STATIC_SECURITY_HEADERS = (
+    ("Permissions-Policy", "browsing-topics=()"),
+    ("X-Frame-Options", "SAMEORIGIN"),
+    ("X-Content-Type-Options", "nosniff"),
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+)
+
+
+def init_static_security_headers(app):
+    """
+    Apply Talisman's default response headers without Talisman.
+    
+    With HTTPS redirects, HSTS and CSP disabled the headers never change, so a single
+    after_request hook replaces Talisman's per-request option resolution. Use
+    talisman.init_app() instead once any of those features are enabled. Session
+    cookie settings are configured in configure_app.
+    """
+    @app.after_request
+    def set_security_headers(response):
+        for name, value in STATIC_SECURITY_HEADERS:
+            response.headers[name] = value
+        return response
@@ -6,13 +6,30 @@ Kafka consumer for issue tracker - listens to issues topic and writes to Firebas
 import logging
 import threading
 import time
-from typing import Optional
+from typing import List, Optional
+
+from apps.web.models import Issue, IssuePriority, IssueType, enum_coercer
 
 logger = logging.getLogger(__name__)
 
+# Value -> member lookups for message enum fields (plain dict hits instead of Enum value lookups)
+_to_type = enum_coercer(IssueType)
+_to_priority = enum_coercer(IssuePriority)
+
 # Kafka topic for issues
 ISSUES_TOPIC = "alphafusion.issues"
 
+# Consumer group shared by all workers, so Kafka spreads partitions across them
+CONSUMER_GROUP_ID = "issuetracker-consumer"
+
+# Long-poll settings: poll() returns as soon as records arrive, so a long timeout only
+# matters for idle topics, where it cuts down on empty fetch round-trips
+DEFAULT_POLL_TIMEOUT_MS = 5000
+DEFAULT_MAX_RECORDS = 10
+
+# How long a Firebase availability probe result is reused before asking the provider again
+FIREBASE_AVAILABILITY_TTL_SECONDS = 1.0
+
 
 class IssueTrackerConsumer:
     """
@@ -26,7 +43,10 @@ class IssueTrackerConsumer:
     def __init__(
         self,
         queue_consumer=None,
-        firebase_provider=None
+        firebase_provider=None,
+        poll_timeout_ms: int = DEFAULT_POLL_TIMEOUT_MS,
+        max_records: int = DEFAULT_MAX_RECORDS,
+        num_workers: int = 1
     ):
         """
         Initialize Kafka consumer.
@@ -34,13 +54,28 @@ class IssueTrackerConsumer:
         Args:
             queue_consumer: Optional QueueConsumer instance. If None, creates default from factory.
             firebase_provider: Optional FirebaseHelperProvider instance. If None, creates default.
+            poll_timeout_ms: How long each poll waits for records on an idle topic.
+            max_records: Maximum number of records returned by a single poll.
+            num_workers: Number of consumer threads. Each extra worker builds its own
+                QueueConsumer in the same group, so Kafka splits the topic's partitions between them.
         """
         self.consumer = queue_consumer
         self.firebase_provider = firebase_provider
-        self.running = False
-        self.thread: Optional[threading.Thread] = None
+        self.poll_timeout_ms = poll_timeout_ms
+        self.max_records = max_records
+        self.num_workers = max(1, num_workers)
+        self.threads: List[threading.Thread] = []
+        # Set on shutdown; waiting on it instead of sleeping lets stop() wake the loop at once
+        self._stop = threading.Event()
+        self._firebase_available = False
+        self._firebase_checked_at: Optional[float] = None
         self._initialize()
     
+    @property
+    def running(self) -> bool:
+        """Whether the consumption loop has been started and not yet stopped"""
+        return bool(self.threads) and not self._stop.is_set()
+    
     def _initialize(self):
         """Initialize consumer and providers"""
         try:
@@ -58,29 +93,34 @@ class IssueTrackerConsumer:
                 logger.warning("Kafka consumer not available - issue tracking will not work")
                 return
             
-            # Kafka consumers are lazy - they only connect when subscribe() is called
-            # Try to subscribe - this will trigger the connection
-            try:
-                if self.consumer.subscribe([ISSUES_TOPIC], group_id="issuetracker-consumer"):
-                    logger.info(f"Subscribed to Kafka topic: {ISSUES_TOPIC}")
-                    # Verify connection after subscription (consumers connect on subscribe)
-                    if self.consumer.is_connected():
-                        logger.info("Kafka consumer connected successfully")
-                    else:
-                        logger.warning("Kafka consumer subscribed but connection not verified - may connect later")
-                else:
-                    logger.error("Failed to subscribe to issues topic")
-                    self.consumer = None
-            except Exception as e:
-                logger.warning(f"Failed to subscribe to Kafka topic (Kafka may be unavailable): {e}")
+            if not self._subscribe(self.consumer):
                 self.consumer = None
         
         except Exception as e:
             logger.error(f"Failed to initialize Kafka consumer: {e}", exc_info=True)
             self.consumer = None
     
+    @staticmethod
+    def _subscribe(consumer) -> bool:
+        """Subscribe a queue consumer to the issues topic, returning whether it succeeded"""
+        # Kafka consumers are lazy - they only connect when subscribe() is called
+        # Try to subscribe - this will trigger the connection
+        try:
+            if consumer.subscribe([ISSUES_TOPIC], group_id=CONSUMER_GROUP_ID):
+                logger.info(f"Subscribed to Kafka topic: {ISSUES_TOPIC}")
+                # Verify connection after subscription (consumers connect on subscribe)
+                if consumer.is_connected():
+                    logger.info("Kafka consumer connected successfully")
+                else:
+                    logger.warning("Kafka consumer subscribed but connection not verified - may connect later")
+                return True
+            logger.error("Failed to subscribe to issues topic")
+        except Exception as e:
+            logger.warning(f"Failed to subscribe to Kafka topic (Kafka may be unavailable): {e}")
+        return False
+    
     def start(self):
-        """Start the consumer in a background thread"""
+        """Start the consumer in background threads (one per worker)"""
         if not self.consumer:
             logger.warning("Kafka consumer not available, cannot start")
             return
@@ -89,103 +129,159 @@ class IssueTrackerConsumer:
             logger.warning("Consumer already running")
             return
         
-        self.running = True
-        self.thread = threading.Thread(target=self._consume_loop, daemon=True)
-        self.thread.start()
-        logger.info("Issue tracker Kafka consumer started")
+        self._stop.clear()
+        # The first worker polls the injected/initial consumer; the rest build their own,
+        # since a Kafka consumer must not be shared between threads
+        self.threads = [threading.Thread(target=self._consume_loop, daemon=True)]
+        self.threads.extend(
+            threading.Thread(target=self._run_extra_worker, daemon=True)
+            for _ in range(self.num_workers - 1)
+        )
+        for thread in self.threads:
+            thread.start()
+        logger.info(f"Issue tracker Kafka consumer started ({self.num_workers} worker(s))")
     
     def stop(self):
         """Stop the consumer"""
-        self.running = False
+        self._stop.set()
         if self.consumer:
             try:
                 self.consumer.close()
             except Exception as e:
                 logger.warning(f"Error closing consumer: {e}")
         
-        if self.thread:
-            self.thread.join(timeout=5)
+        for thread in self.threads:
+            # Allow an in-flight poll to finish (extra workers close their own consumers on exit)
+            thread.join(timeout=self.poll_timeout_ms / 1000 + 1)
         
         logger.info("Issue tracker Kafka consumer stopped")
     
-    def _consume_loop(self):
-        """Main consumption loop"""
+    def _run_extra_worker(self):
+        """Create, subscribe and drive a worker-owned consumer until stop()"""
+        try:
+            from alphafusion.storage.queue_factory import create_queue_consumer
+            consumer = create_queue_consumer()
+        except Exception as e:
+            logger.error(f"Failed to create Kafka consumer for worker: {e}", exc_info=True)
+            return
+        
+        if not consumer or not self._subscribe(consumer):
+            logger.warning("Kafka consumer worker not available, partitions stay with the remaining workers")
+            return
+        
+        try:
+            self._consume_loop(consumer)
+        finally:
+            try:
+                consumer.close()
+            except Exception as e:
+                logger.warning(f"Error closing consumer: {e}")
+    
+    def _consume_loop(self, consumer=None):
+        """
+        Main consumption loop.
+        
+        Args:
+            consumer: QueueConsumer to poll. Defaults to the consumer created in _initialize.
+        """
+        consumer = consumer or self.consumer
         logger.info("Starting issue consumption loop")
         
-        while self.running:
+        while not self._stop.is_set():
             try:
-                # Poll for messages (timeout: 1 second)
-                messages = self.consumer.poll(timeout_ms=1000, max_records=10)
+                # Poll for messages (long poll - returns early once records are available)
+                messages = consumer.poll(timeout_ms=self.poll_timeout_ms, max_records=self.max_records)
                 
                 if messages:
-                    for message in messages:
-                        try:
-                            self._process_issue(message.value)
-                            # Commit after processing
-                            self.consumer.commit()
-                        except Exception as e:
-                            logger.error(f"Error processing issue message: {e}", exc_info=True)
-                            # Still commit to avoid reprocessing bad messages
-                            self.consumer.commit()
+                    self._process_issues([message.value for message in messages])
+                    # Commit once the batch has been handled (bad messages are skipped, not retried)
+                    consumer.commit()
                 
-                # Small sleep to avoid busy waiting
-                time.sleep(0.1)
+                # No extra sleep: poll() already blocks up to its timeout when the topic is idle
             
             except Exception as e:
                 logger.error(f"Error in consumption loop: {e}", exc_info=True)
-                time.sleep(1)  # Wait before retrying
+                self._stop.wait(1)  # Wait before retrying (returns early on stop())
     
-    def _process_issue(self, issue_data: dict):
+    def _process_issues(self, issues_data: List[dict]):
         """
-        Process an issue message from Kafka and write to Firebase.
+        Process a batch of issue messages from Kafka and write them to Firebase.
         
         This is the single point where issues are written to Firebase.
-        All issues (from web UI or services) go through this flow.
+        All issues (from web UI or services) go through this flow. The whole
+        poll batch is written with batched Firestore writes instead of one
+        round-trip per issue.
         
         Args:
-            issue_data: Issue data dictionary from Kafka message
+            issues_data: Issue data dictionaries from the polled Kafka messages
         """
-        if not self.firebase_provider or not self.firebase_provider.is_available():
-            logger.warning("Firebase provider not available, cannot process issue")
+        if not self._is_firebase_available():
+            logger.warning("Firebase provider not available, cannot process issues")
+            return
+        
+        issues = []
+        for issue_data in issues_data:
+            try:
+                issues.append(self._parse_issue(issue_data))
+            except Exception as e:
+                logger.error(f"Error parsing issue message: {e}", exc_info=True)
+        
+        if not issues:
             return
         
         try:
-            from apps.web.models import Issue, IssueStatus, IssuePriority, IssueType
-            
-            # Parse issue data
-            title = issue_data.get("title", "Untitled Issue")
-            description = issue_data.get("description", "")
-            issue_type = IssueType(issue_data.get("type", "bug"))
-            priority = IssuePriority(issue_data.get("priority", "medium"))
-            reporter_id = issue_data.get("reporter_id", "system")
-            assignee_id = issue_data.get("assignee_id")
-            tags = issue_data.get("tags", [])
-            
-            # Create issue model
-            issue = Issue(
-                title=title,
-                description=description,
-                type=issue_type,
-                priority=priority,
-                reporter_id=reporter_id,
-                assignee_id=assignee_id,
-                tags=tags
-            )
-            
-            # Create issue in Firebase
-            issue_id = self.firebase_provider.create_issue(issue)
-            
+            issue_ids = self.firebase_provider.create_issues_batch(issues)
+        except Exception as e:
+            logger.error(f"Error writing issues to Firebase: {e}", exc_info=True)
+            return
+        
+        created = 0
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        for issue, issue_id in zip(issues, issue_ids):
             if issue_id:
-                logger.info(f"Created issue {issue_id} from Kafka: {title[:50]}")
+                created += 1
+                if debug_enabled:
+                    logger.debug("Created issue %s from Kafka: %s", issue_id, issue.title[:50])
             else:
-                logger.error(f"Failed to create issue in Firebase: {title[:50]}")
+                logger.error("Failed to create issue in Firebase: %s", issue.title[:50])
         
-        except Exception as e:
-            logger.error(f"Error processing issue: {e}", exc_info=True)
+        # One summary line per poll batch instead of one per message
+        if created:
+            logger.info("Created %d issue(s) from Kafka", created)
+    
+    def _is_firebase_available(self) -> bool:
+        """Check Firebase availability, reusing the last probe result for a short TTL"""
+        if not self.firebase_provider:
+            return False
+        
+        now = time.monotonic()
+        if self._firebase_checked_at is None or now - self._firebase_checked_at > FIREBASE_AVAILABILITY_TTL_SECONDS:
+            self._firebase_available = self.firebase_provider.is_available()
+            self._firebase_checked_at = now
+        return self._firebase_available
+    
+    @staticmethod
+    def _parse_issue(issue_data: dict) -> Issue:
+        """
+        Build an Issue model from a Kafka message payload.
+        
+        Raises:
+            ValueError: If the type or priority is not a valid enum value
+        """
+        return Issue(
+            title=issue_data.get("title", "Untitled Issue"),
+            description=issue_data.get("description", ""),
+            type=_to_type(issue_data.get("type", "bug")),
+            priority=_to_priority(issue_data.get("priority", "medium")),
+            reporter_id=issue_data.get("reporter_id", "system"),
+            assignee_id=issue_data.get("assignee_id"),
+            tags=issue_data.get("tags", [])
+        )
 
 
-# Global consumer instance
+# Global consumer instance (created/stopped under _consumer_lock)
 _consumer_instance: Optional[IssueTrackerConsumer] = None
+_consumer_lock = threading.Lock()
 
 
 def get_consumer() -> Optional[IssueTrackerConsumer]:
@@ -195,7 +291,8 @@ def get_consumer() -> Optional[IssueTrackerConsumer]:
 
 def start_consumer(
     queue_consumer=None,
-    firebase_provider=None
+    firebase_provider=None,
+    num_workers: int = 1
 ):
     """
     Start the global consumer.
@@ -203,21 +300,26 @@ def start_consumer(
     Args:
         queue_consumer: Optional QueueConsumer instance. If None, creates default from factory.
         firebase_provider: Optional FirebaseHelperProvider instance. If None, creates default.
+        num_workers: Number of consumer threads (bounded in practice by the topic's partition count).
     """
     global _consumer_instance
     if _consumer_instance is None:
-        _consumer_instance = IssueTrackerConsumer(
-            queue_consumer=queue_consumer,
-            firebase_provider=firebase_provider
-        )
-        _consumer_instance.start()
+        with _consumer_lock:
+            if _consumer_instance is None:
+                _consumer_instance = IssueTrackerConsumer(
+                    queue_consumer=queue_consumer,
+                    firebase_provider=firebase_provider,
+                    num_workers=num_workers
+                )
+                _consumer_instance.start()
     return _consumer_instance
 
 
 def stop_consumer():
     """Stop the global consumer"""
     global _consumer_instance
-    if _consumer_instance:
-        _consumer_instance.stop()
-        _consumer_instance = None
+    with _consumer_lock:
+        if _consumer_instance:
+            _consumer_instance.stop()
+            _consumer_instance = None
 
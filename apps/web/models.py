@@ -3,11 +3,29 @@
 Data models for Issue Tracker
 """
 
-from dataclasses import dataclass, field, asdict
+import sys
+from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
 
+# datetime.fromisoformat() accepts a trailing "Z" natively from Python 3.11
+_ISO_NATIVE_Z = sys.version_info >= (3, 11)
+# Bound once so _parse_iso skips the datetime attribute lookup per field
+_fromiso = datetime.fromisoformat
+
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+; plain dataclasses on 3.9
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _parse_iso(value: Any) -> Any:
+    """Parse an ISO 8601 string to datetime; non-string values (None, Firestore timestamps) pass through"""
+    if not isinstance(value, str):
+        return value
+    if _ISO_NATIVE_Z:
+        return _fromiso(value)
+    return _fromiso(value[:-1] + "+00:00" if value.endswith("Z") else value)
+
 
 class IssueStatus(str, Enum):
     """Issue status enumeration"""
@@ -68,7 +86,30 @@ class NotificationType(str, Enum):
     COMMENTED = "commented"
 
 
-@dataclass
+def enum_coercer(enum_cls):
+    """Build a dict-backed value -> member lookup that raises ValueError like the Enum constructor"""
+    members = {member.value: member for member in enum_cls}
+    
+    def coerce(value):
+        try:
+            return members[value]
+        except KeyError:
+            raise ValueError(f"{value!r} is not a valid {enum_cls.__name__}") from None
+    
+    return coerce
+
+
+# Value -> member lookups used by from_dict (plain dict hits instead of Enum.__call__)
+_to_status = enum_coercer(IssueStatus)
+_to_priority = enum_coercer(IssuePriority)
+_to_type = enum_coercer(IssueType)
+_to_category = enum_coercer(BacklogCategory)
+_to_role = enum_coercer(UserRole)
+_to_activity_type = enum_coercer(ActivityType)
+_to_notification_type = enum_coercer(NotificationType)
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Attachment:
     """Attachment model"""
     url: str
@@ -88,9 +129,7 @@ class Attachment:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Attachment":
         """Create from dictionary"""
-        uploaded_at = data.get("uploadedAt") or data.get("uploaded_at")
-        if isinstance(uploaded_at, str):
-            uploaded_at = datetime.fromisoformat(uploaded_at.replace("Z", "+00:00"))
+        uploaded_at = _parse_iso(data.get("uploadedAt") or data.get("uploaded_at"))
         return cls(
             url=data["url"],
             name=data["name"],
@@ -99,7 +138,15 @@ class Attachment:
         )
 
 
-@dataclass
+def _attachments_from_list(raw: Optional[List[Any]]) -> List[Attachment]:
+    """Build Attachment models from a Firestore list (entries that are already models pass through)"""
+    if not raw:
+        return []
+    from_dict = Attachment.from_dict
+    return [from_dict(att) if isinstance(att, dict) else att for att in raw]
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class User:
     """User model"""
     uid: str
@@ -129,24 +176,20 @@ class User:
     @classmethod
     def from_dict(cls, uid: str, data: Dict[str, Any]) -> "User":
         """Create from Firestore document"""
-        created_at = data.get("createdAt")
-        if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-        last_login = data.get("lastLogin")
-        if isinstance(last_login, str):
-            last_login = datetime.fromisoformat(last_login.replace("Z", "+00:00"))
+        created_at = _parse_iso(data.get("createdAt"))
+        last_login = _parse_iso(data.get("lastLogin"))
         return cls(
             uid=uid,
             email=data.get("email", ""),
             display_name=data.get("displayName") or data.get("display_name"),
             photo_url=data.get("photoURL") or data.get("photo_url"),
-            role=UserRole(data.get("role", "viewer")),
+            role=_to_role(data.get("role", "viewer")),
             created_at=created_at,
             last_login=last_login
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Comment:
     """Comment model"""
     id: Optional[str] = None
@@ -156,8 +199,8 @@ class Comment:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for Firestore"""
+    def to_dict(self, include_id: bool = False) -> Dict[str, Any]:
+        """Convert to dictionary for Firestore (include_id adds the document ID for API responses)"""
         result = {
             "issueId": self.issue_id or "",
             "authorId": self.author_id,
@@ -167,17 +210,19 @@ class Comment:
             result["createdAt"] = self.created_at
         if self.updated_at:
             result["updatedAt"] = self.updated_at
+        if include_id:
+            result["id"] = self.id
         return result
 
+    def as_response_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for API responses (includes the comment ID)"""
+        return self.to_dict(include_id=True)
+
     @classmethod
     def from_dict(cls, comment_id: str, data: Dict[str, Any]) -> "Comment":
         """Create from Firestore document"""
-        created_at = data.get("createdAt")
-        if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-        updated_at = data.get("updatedAt")
-        if isinstance(updated_at, str):
-            updated_at = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
+        created_at = _parse_iso(data.get("createdAt"))
+        updated_at = _parse_iso(data.get("updatedAt"))
         return cls(
             id=comment_id,
             issue_id=data.get("issueId") or data.get("issue_id"),
@@ -188,7 +233,7 @@ class Comment:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Activity:
     """Activity log model"""
     id: Optional[str] = None
@@ -211,19 +256,17 @@ class Activity:
     @classmethod
     def from_dict(cls, activity_id: str, data: Dict[str, Any]) -> "Activity":
         """Create from Firestore document"""
-        created_at = data.get("createdAt")
-        if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        created_at = _parse_iso(data.get("createdAt"))
         return cls(
             id=activity_id,
-            type=ActivityType(data.get("type", "updated")),
+            type=_to_activity_type(data.get("type", "updated")),
             user_id=data.get("userId") or data.get("user_id", ""),
             changes=data.get("changes", []),
             created_at=created_at
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Issue:
     """Issue model"""
     id: Optional[str] = None
@@ -240,8 +283,8 @@ class Issue:
     updated_at: Optional[datetime] = None
     resolved_at: Optional[datetime] = None
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for Firestore"""
+    def to_dict(self, include_id: bool = False) -> Dict[str, Any]:
+        """Convert to dictionary for Firestore (include_id adds the document ID for API responses)"""
         result = {
             "title": self.title,
             "description": self.description,
@@ -260,31 +303,28 @@ class Issue:
             result["updatedAt"] = self.updated_at
         if self.resolved_at:
             result["resolvedAt"] = self.resolved_at
+        if include_id:
+            result["id"] = self.id
         return result
 
+    def as_response_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for API responses (includes the issue ID)"""
+        return self.to_dict(include_id=True)
+
     @classmethod
     def from_dict(cls, issue_id: str, data: Dict[str, Any]) -> "Issue":
         """Create from Firestore document"""
-        created_at = data.get("createdAt")
-        if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-        updated_at = data.get("updatedAt")
-        if isinstance(updated_at, str):
-            updated_at = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
-        resolved_at = data.get("resolvedAt")
-        if isinstance(resolved_at, str):
-            resolved_at = datetime.fromisoformat(resolved_at.replace("Z", "+00:00"))
-        attachments = [
-            Attachment.from_dict(att) if isinstance(att, dict) else att
-            for att in data.get("attachments", [])
-        ]
+        created_at = _parse_iso(data.get("createdAt"))
+        updated_at = _parse_iso(data.get("updatedAt"))
+        resolved_at = _parse_iso(data.get("resolvedAt"))
+        attachments = _attachments_from_list(data.get("attachments"))
         return cls(
             id=issue_id,
             title=data.get("title", ""),
             description=data.get("description", ""),
-            status=IssueStatus(data.get("status", "open")),
-            priority=IssuePriority(data.get("priority", "medium")),
-            type=IssueType(data.get("type", "task")),
+            status=_to_status(data.get("status", "open")),
+            priority=_to_priority(data.get("priority", "medium")),
+            type=_to_type(data.get("type", "task")),
             reporter_id=data.get("reporterId") or data.get("reporter_id", ""),
             assignee_id=data.get("assigneeId") or data.get("assignee_id"),
             tags=data.get("tags", []),
@@ -295,7 +335,7 @@ class Issue:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Backlog:
     """Backlog item model"""
     id: Optional[str] = None
@@ -333,24 +373,15 @@ class Backlog:
     @classmethod
     def from_dict(cls, backlog_id: str, data: Dict[str, Any]) -> "Backlog":
         """Create from Firestore document"""
-        created_at = data.get("createdAt")
-        if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-        updated_at = data.get("updatedAt")
-        if isinstance(updated_at, str):
-            updated_at = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
-        completed_at = data.get("completedAt")
-        if isinstance(completed_at, str):
-            completed_at = datetime.fromisoformat(completed_at.replace("Z", "+00:00"))
-        attachments = [
-            Attachment.from_dict(att) if isinstance(att, dict) else att
-            for att in data.get("attachments", [])
-        ]
+        created_at = _parse_iso(data.get("createdAt"))
+        updated_at = _parse_iso(data.get("updatedAt"))
+        completed_at = _parse_iso(data.get("completedAt"))
+        attachments = _attachments_from_list(data.get("attachments"))
         return cls(
             id=backlog_id,
             title=data.get("title", ""),
             description=data.get("description", ""),
-            category=BacklogCategory(data.get("category", "feature-request")),
+            category=_to_category(data.get("category", "feature-request")),
             reporter_id=data.get("reporterId") or data.get("reporter_id", ""),
             assignee_id=data.get("assigneeId") or data.get("assignee_id"),
             tags=data.get("tags", []),
@@ -361,7 +392,7 @@ class Backlog:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Notification:
     """Notification model"""
     id: Optional[str] = None
@@ -389,13 +420,11 @@ class Notification:
     @classmethod
     def from_dict(cls, notification_id: str, data: Dict[str, Any]) -> "Notification":
         """Create from Firestore document"""
-        created_at = data.get("createdAt")
-        if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        created_at = _parse_iso(data.get("createdAt"))
         return cls(
             id=notification_id,
             user_id=data.get("userId") or data.get("user_id", ""),
-            type=NotificationType(data.get("type", "commented")),
+            type=_to_notification_type(data.get("type", "commented")),
             issue_id=data.get("issueId") or data.get("issue_id"),
             message=data.get("message", ""),
             read=data.get("read", False),
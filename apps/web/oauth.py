@@ -7,25 +7,37 @@ This module uses the OAuthProvider from alphafusion-core for OAuth functionality
 """
 
 import logging
-from typing import Optional
-from flask import session, url_for, redirect, request
+from typing import Optional, TYPE_CHECKING
+from flask import session, url_for, request
 
-from alphafusion.auth.oauth_factory import get_default_google_oauth_provider
-from alphafusion.auth.oauth_provider import OAuthProvider
+if TYPE_CHECKING:
+    from alphafusion.auth.oauth_provider import OAuthProvider
 
 logger = logging.getLogger(__name__)
 
+# Google OAuth client credentials (resolved by alphafusion-core's credential loader)
+GOOGLE_CREDENTIAL_PATH = "app/issuetracker/google-issuetracker.json"
+
+# Email domains allowed to sign in (provider format, with the leading "@")
+ALLOWED_EMAIL_DOMAINS = ["@quantory.app"]
+# Bare lowercase domains for the per-request check in is_quantory_email
+_ALLOWED_DOMAINS = frozenset(domain.lstrip("@").lower() for domain in ALLOWED_EMAIL_DOMAINS)
+
 # OAuth provider instance (initialized in init_oauth)
-_oauth_provider: Optional[OAuthProvider] = None
+_oauth_provider: Optional["OAuthProvider"] = None
 
 
 def init_oauth(app):
     """Initialize OAuth with Flask app"""
     global _oauth_provider
     
+    # Imported here so processes that never authenticate don't load the OAuth stack
+    from alphafusion.auth.oauth_factory import get_default_google_oauth_provider
+    
+    # A fresh provider per app: initialize(app) may keep per-app state, so providers aren't shared
     provider = get_default_google_oauth_provider(
-        credential_path="app/issuetracker/google-issuetracker.json",
-        allowed_email_domains=["@quantory.app"]
+        credential_path=GOOGLE_CREDENTIAL_PATH,
+        allowed_email_domains=ALLOWED_EMAIL_DOMAINS
     )
     
     if provider:
@@ -37,10 +49,12 @@ def init_oauth(app):
 
 
 def is_quantory_email(email: str) -> bool:
-    """Check if email is from quantory.app domain"""
-    if not _oauth_provider:
-        return email and email.endswith('@quantory.app')
-    return _oauth_provider.validate_email_domain(email, ["@quantory.app"])
+    """Check if email is from quantory.app domain (called on every authenticated request)"""
+    if not email:
+        return False
+    # Domains are case-insensitive
+    _, at, domain = email.rpartition("@")
+    return bool(at) and domain.lower() in _ALLOWED_DOMAINS
 
 
 def get_google_oauth():
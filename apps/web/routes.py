@@ -4,11 +4,14 @@ Web UI routes for Issue Tracker
 """
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Dict, Iterable, Optional, Set
 from flask import render_template, request, redirect, url_for, jsonify, flash, session, current_app
 from apps.web.models import (
-    Issue, Comment, IssueStatus, IssuePriority, IssueType, UserRole,
-    Backlog, BacklogCategory
+    Issue, Comment, IssueStatus, IssuePriority, IssueType, User, UserRole,
+    Backlog, BacklogCategory, enum_coercer
 )
 from apps.web.schemas import (
     IssueCreateSchema, IssueUpdateSchema, CommentCreateSchema,
@@ -20,12 +23,83 @@ from apps.web.oauth import start_google_oauth, handle_google_callback, is_quanto
 
 logger = logging.getLogger(__name__)
 
+# Query/form value -> enum member lookups (plain dict hits; invalid values raise ValueError)
+_to_status = enum_coercer(IssueStatus)
+_to_priority = enum_coercer(IssuePriority)
+_to_type = enum_coercer(IssueType)
+_to_category = enum_coercer(BacklogCategory)
+
+# Shared pool for Firestore reads a page can issue concurrently
+_IO_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="web-io")
+
+# How long the user directory shown next to issues is reused before re-reading Firestore
+USERS_CACHE_TTL_SECONDS = 60
+
+# How long the dashboard's per-status issue counts are reused before re-counting in Firestore
+STATS_CACHE_TTL_SECONDS = 30
+
 
 def _get_firebase_provider():
     """Get Firebase provider from Flask app context"""
     return getattr(current_app, 'firebase_helper_provider', None)
 
 
+def _get_users_dict(firebase_provider, uids: Iterable[Optional[str]]) -> Dict[str, User]:
+    """
+    Get the users referenced on a page, keyed by uid, for template display.
+    
+    Only the given uids are read (one batched Firestore read for the ones not seen yet).
+    Lookups, including misses, are cached on the app for USERS_CACHE_TTL_SECONDS.
+    """
+    cached = getattr(current_app, 'users_cache', None)
+    now = time.monotonic()
+    if not cached or now - cached[0] >= USERS_CACHE_TTL_SECONDS:
+        cached = (now, {})
+        current_app.users_cache = cached
+    known_users = cached[1]
+    
+    wanted = {uid for uid in uids if uid}
+    missing = [uid for uid in wanted if uid not in known_users]
+    if missing:
+        found = firebase_provider.get_users_by_ids(missing)
+        for uid in missing:
+            known_users[uid] = found.get(uid)
+    
+    return {uid: known_users[uid] for uid in wanted if known_users[uid] is not None}
+
+
+def _referenced_user_ids(items) -> Set[Optional[str]]:
+    """Reporter and assignee uids of a list of issues or backlog items"""
+    return {item.reporter_id for item in items} | {item.assignee_id for item in items}
+
+
+def _invalidate_users_cache():
+    """Drop the cached user directory (after a user is created or updated)"""
+    current_app.users_cache = None
+
+
+def _get_issue_counts(firebase_provider) -> Dict[str, int]:
+    """
+    Get per-status issue counts (plus "total") for the dashboard.
+    
+    Cached on the app for STATS_CACHE_TTL_SECONDS; issues created through Kafka show up
+    once the TTL passes. Failed counts (empty result) are not cached.
+    """
+    cached = getattr(current_app, 'issue_counts_cache', None)
+    now = time.monotonic()
+    if cached and now - cached[0] < STATS_CACHE_TTL_SECONDS:
+        return cached[1]
+    
+    counts = firebase_provider.count_issues_by_status()
+    current_app.issue_counts_cache = (now, counts) if counts else None
+    return counts
+
+
+def invalidate_issue_counts():
+    """Drop the cached dashboard counts (after an issue changes status, from the web UI or the API)"""
+    current_app.issue_counts_cache = None
+
+
 def register_routes(app):
     """Register all web UI routes"""
     
@@ -82,7 +156,7 @@ def register_routes(app):
                 return redirect(url_for("landing"))
             
             # Get display name from OAuth session
-            display_name = session.get('oauth_name') or email.split('@')[0]
+            display_name = session.get('oauth_name') or email.partition('@')[0]
             
             # Try to get or create user in Firebase (optional - Firebase may not be configured)
             firebase_provider = _get_firebase_provider()
@@ -92,6 +166,7 @@ def register_routes(app):
                     user = firebase_provider.get_user(email)
                     if not user:
                         # Auto-create user account for first-time login (normal behavior)
+                        # The new document already carries the OAuth name/picture, so no refresh write is needed
                         photo_url = session.get('oauth_picture')
                         logger.info(f"First-time login detected - creating user account for {email}")
                         user = firebase_provider.create_user(
@@ -103,13 +178,19 @@ def register_routes(app):
                         )
                         if user:
                             logger.info(f"Created user account for {email} in Firebase")
-                    
-                    # Update user info if available (for existing users or to refresh OAuth data)
-                    if user:
+                            _invalidate_users_cache()
+                    else:
+                        # Refresh OAuth data for existing users in a single write
+                        oauth_updates = {}
                         if session.get('oauth_name'):
-                            firebase_provider.update_user(email, display_name=session.get('oauth_name'))
+                            oauth_updates["display_name"] = session.get('oauth_name')
                         if session.get('oauth_picture'):
-                            firebase_provider.update_user(email, photo_url=session.get('oauth_picture'))
+                            oauth_updates["photo_url"] = session.get('oauth_picture')
+                        if oauth_updates:
+                            firebase_provider.update_user(email, **oauth_updates)
+                            _invalidate_users_cache()
+                    
+                    if user:
                         # Use display name from Firebase user if available
                         display_name = user.display_name or display_name
                 except Exception as firebase_err:
@@ -153,19 +234,18 @@ def register_routes(app):
                 flash("Firebase provider not available", "error")
                 return render_template("dashboard.html", stats={}, recent_issues=[], grouped_issues=[])
             
-            # Get statistics
-            all_issues = firebase_provider.list_issues(limit=1000)
-            
+            # Get statistics (Firestore count aggregations - no issue documents are read)
+            status_counts = _get_issue_counts(firebase_provider)
             stats = {
-                "total": len(all_issues),
-                "open": len([i for i in all_issues if i.status == IssueStatus.OPEN]),
-                "in_progress": len([i for i in all_issues if i.status == IssueStatus.IN_PROGRESS]),
-                "resolved": len([i for i in all_issues if i.status == IssueStatus.RESOLVED]),
-                "closed": len([i for i in all_issues if i.status == IssueStatus.CLOSED]),
+                "total": status_counts.get("total", 0),
+                "open": status_counts.get(IssueStatus.OPEN.value, 0),
+                "in_progress": status_counts.get(IssueStatus.IN_PROGRESS.value, 0),
+                "resolved": status_counts.get(IssueStatus.RESOLVED.value, 0),
+                "closed": status_counts.get(IssueStatus.CLOSED.value, 0),
             }
             
-            # Get recent issues and group duplicates by title
-            recent_issues = sorted(all_issues, key=lambda x: x.created_at or datetime.min, reverse=True)[:10]
+            # Get recent issues (list_issues is ordered by createdAt descending) and group duplicates by title
+            recent_issues = firebase_provider.list_issues(limit=10)
             
             # Group duplicates by title (case-insensitive, normalized)
             grouped_issues = {}
@@ -257,8 +337,7 @@ def register_routes(app):
             
             # Get users for display
             if firebase_provider:
-                users = firebase_provider.list_users()
-                users_dict = {user.uid: user for user in users}
+                users_dict = _get_users_dict(firebase_provider, _referenced_user_ids(issues))
             else:
                 users_dict = {}
             
@@ -281,11 +360,11 @@ def register_routes(app):
             # Get query parameters
             filters = {}
             if request.args.get("status"):
-                filters["status"] = IssueStatus(request.args.get("status"))
+                filters["status"] = _to_status(request.args.get("status"))
             if request.args.get("priority"):
-                filters["priority"] = IssuePriority(request.args.get("priority"))
+                filters["priority"] = _to_priority(request.args.get("priority"))
             if request.args.get("type"):
-                filters["type"] = IssueType(request.args.get("type"))
+                filters["type"] = _to_type(request.args.get("type"))
             if request.args.get("assignee_id"):
                 filters["assignee_id"] = request.args.get("assignee_id")
             if request.args.get("reporter_id"):
@@ -329,8 +408,7 @@ def register_routes(app):
             grouped_list.sort(key=lambda x: x['primary'].created_at or datetime.min, reverse=True)
             
             # Get users for display
-            users = firebase_provider.list_users()
-            users_dict = {user.uid: user for user in users}
+            users_dict = _get_users_dict(firebase_provider, _referenced_user_ids(issues))
             
             return render_template("issues.html", issues=issues, users=users_dict, filters=request.args, source="all", grouped_issues=grouped_list)
         except Exception as e:
@@ -354,20 +432,22 @@ def register_routes(app):
                 flash("Firebase provider not available", "error")
                 return redirect(url_for("issues_list"))
             
-            issue = firebase_provider.get_issue(issue_id)
+            # Issue, comments and activities are independent reads - run them concurrently
+            issue_future = _IO_POOL.submit(firebase_provider.get_issue, issue_id)
+            comments_future = _IO_POOL.submit(firebase_provider.get_comments, issue_id)
+            activities_future = _IO_POOL.submit(firebase_provider.get_activities, issue_id)
+            
+            issue = issue_future.result()
             if not issue:
                 flash("Issue not found", "error")
                 return redirect(url_for("issues_list"))
             
-            # Get comments
-            comments = firebase_provider.get_comments(issue_id)
-            
-            # Get activities
-            activities = firebase_provider.get_activities(issue_id)
+            comments = comments_future.result()
+            activities = activities_future.result()
             
-            # Get users for display
-            users = firebase_provider.list_users()
-            users_dict = {user.uid: user for user in users}
+            # Get users for display (people on the issue and comment authors)
+            user_ids = _referenced_user_ids([issue]) | {comment.author_id for comment in comments}
+            users_dict = _get_users_dict(firebase_provider, user_ids)
             
             return render_template(
                 "issue_detail.html",
@@ -462,15 +542,12 @@ def register_routes(app):
                 flash("Firebase provider not available", "error")
                 return redirect(url_for("issues_list"))
             
-            # Get current issue
-            issue = firebase_provider.get_issue(issue_id)
-            if not issue:
-                flash("Issue not found", "error")
-                return redirect(url_for("issues_list"))
+            # No separate existence check: update_issue reads the issue document itself
+            # and returns False if it is missing
             
             # Validate request
-            form_data = request.form.to_dict()
-            data = validate_json_body(IssueUpdateSchema, form_data)
+            # The schema reads the form mapping directly (first value per key, same as to_dict())
+            data = validate_json_body(IssueUpdateSchema, request.form)
             
             # Prepare changes
             changes = {}
@@ -479,11 +556,11 @@ def register_routes(app):
             if "description" in data:
                 changes["description"] = data["description"]
             if "status" in data:
-                changes["status"] = IssueStatus(data["status"])
+                changes["status"] = _to_status(data["status"])
             if "priority" in data:
-                changes["priority"] = IssuePriority(data["priority"])
+                changes["priority"] = _to_priority(data["priority"])
             if "type" in data:
-                changes["type"] = IssueType(data["type"])
+                changes["type"] = _to_type(data["type"])
             if "assignee_id" in data:
                 changes["assignee_id"] = data["assignee_id"] if data["assignee_id"] else None
             if "tags" in data:
@@ -498,6 +575,8 @@ def register_routes(app):
             success = firebase_provider.update_issue(issue_id, changes, user_id)
             
             if success:
+                if "status" in changes:
+                    invalidate_issue_counts()
                 flash("Issue updated successfully", "success")
             else:
                 flash("Failed to update issue", "error")
@@ -568,7 +647,7 @@ def register_routes(app):
             # Get query parameters
             filters = {}
             if request.args.get("category"):
-                filters["category"] = BacklogCategory(request.args.get("category"))
+                filters["category"] = _to_category(request.args.get("category"))
             if request.args.get("assignee_id"):
                 filters["assignee_id"] = request.args.get("assignee_id")
             if request.args.get("reporter_id"):
@@ -609,8 +688,7 @@ def register_routes(app):
             grouped_list.sort(key=lambda x: x['primary'].created_at or datetime.min, reverse=True)
             
             # Get users for display
-            users = firebase_provider.list_users()
-            users_dict = {user.uid: user for user in users}
+            users_dict = _get_users_dict(firebase_provider, _referenced_user_ids(backlog_items))
             
             return render_template("backlog.html", backlog_items=backlog_items, users=users_dict, filters=request.args, grouped_backlog=grouped_list)
         except Exception as e:
@@ -658,7 +736,7 @@ def register_routes(app):
             backlog = Backlog(
                 title=data["title"],
                 description=data["description"],
-                category=BacklogCategory(data.get("category", "feature-request")),
+                category=_to_category(data.get("category", "feature-request")),
                 reporter_id=data["reporter_id"],
                 assignee_id=data.get("assignee_id"),
                 tags=data.get("tags", [])
@@ -697,8 +775,7 @@ def register_routes(app):
                 return redirect(url_for("backlog_list"))
             
             # Get users for display
-            users = firebase_provider.list_users()
-            users_dict = {user.uid: user for user in users}
+            users_dict = _get_users_dict(firebase_provider, _referenced_user_ids([backlog]))
             
             return render_template("backlog_detail.html", backlog=backlog, users=users_dict)
         except Exception as e:
@@ -3,6 +3,8 @@
 Input validation schemas for Issue Tracker API endpoints using Marshmallow.
 """
 
+from functools import lru_cache
+
 from marshmallow import Schema, fields, validate, ValidationError
 
 
@@ -264,9 +266,15 @@ class BacklogQuerySchema(Schema):
     )
 
 
+@lru_cache(maxsize=None)
+def get_schema(schema_class):
+    """Get a shared, reusable instance of a schema class (built once per class)"""
+    return schema_class()
+
+
 def validate_query_params(schema_class, data):
     """Validate query parameters using a schema"""
-    schema = schema_class()
+    schema = get_schema(schema_class)
     try:
         return schema.load(data)
     except ValidationError as err:
@@ -275,7 +283,7 @@ def validate_query_params(schema_class, data):
 
 def validate_path_params(schema_class, data):
     """Validate path parameters using a schema"""
-    schema = schema_class()
+    schema = get_schema(schema_class)
     try:
         return schema.load(data)
     except ValidationError as err:
@@ -284,9 +292,8 @@ def validate_path_params(schema_class, data):
 
 def validate_json_body(schema_class, data):
     """Validate JSON body using a schema"""
-    schema = schema_class()
+    schema = get_schema(schema_class)
     try:
         return schema.load(data)
     except ValidationError as err:
         raise ValueError(f"Validation error: {err.messages}")
-
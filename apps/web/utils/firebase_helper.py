@@ -5,6 +5,7 @@ Wraps FirebaseClient for Firestore operations
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from firebase_admin import firestore
@@ -23,6 +24,13 @@ from apps.web.models import (
 
 logger = logging.getLogger(__name__)
 
+# Issues per Firestore write batch (each issue is two writes: the issue and its CREATED activity;
+# Firestore allows at most 500 writes per batch)
+_ISSUES_PER_BATCH = 200
+
+# Runs the per-status aggregation queries concurrently (one per status plus the total)
+_COUNT_POOL = ThreadPoolExecutor(max_workers=len(IssueStatus) + 1, thread_name_prefix="firestore-count")
+
 
 class FirebaseHelper:
     """Helper class for Firebase Firestore operations"""
@@ -122,15 +130,36 @@ class FirebaseHelper:
             logger.error(f"Failed to update user: {e}")
             return False
     
-    def list_users(self) -> List[User]:
-        """List all users"""
+    def get_users_by_ids(self, uids: List[str]) -> Dict[str, User]:
+        """Get several users by UID in one batched read (missing users are left out)"""
+        if not self.db or not uids:
+            return {}
+        
+        try:
+            users_ref = self.db.collection("users")
+            user_docs = self.db.get_all([users_ref.document(uid) for uid in uids])
+            return {
+                user_doc.id: User.from_dict(user_doc.id, user_doc.to_dict())
+                for user_doc in user_docs
+                if user_doc.exists
+            }
+        except Exception as e:
+            logger.error(f"Failed to get users: {e}")
+            return {}
+    
+    def list_users(self, role: Optional[UserRole] = None, limit: Optional[int] = None) -> List[User]:
+        """List users, optionally only those with a given role and/or at most `limit` of them"""
         if not self.db:
             return []
         
         try:
-            users_ref = self.db.collection("users")
+            query = self.db.collection("users")
+            if role is not None:
+                query = query.where("role", "==", role.value if isinstance(role, UserRole) else role)
+            if limit is not None:
+                query = query.limit(limit)
             users = []
-            for doc in users_ref.stream():
+            for doc in query.stream():
                 users.append(User.from_dict(doc.id, doc.to_dict()))
             return users
         except Exception as e:
@@ -165,6 +194,42 @@ class FirebaseHelper:
             logger.error(f"Failed to create issue: {e}")
             return None
     
+    def create_issues_batch(self, issues: List[Issue]) -> List[Optional[str]]:
+        """
+        Create several issues, with their CREATED activity entries, using batched writes.
+        
+        Returns:
+            The new issue IDs in input order (None for issues whose batch failed to commit)
+        """
+        if not self.db:
+            return [None] * len(issues)
+        
+        issues_ref = self.db.collection("issues")
+        issue_ids: List[Optional[str]] = []
+        for start in range(0, len(issues), _ISSUES_PER_BATCH):
+            chunk = issues[start:start + _ISSUES_PER_BATCH]
+            try:
+                batch = self.db.batch()
+                now = datetime.now()
+                doc_refs = []
+                for issue in chunk:
+                    issue.created_at = now
+                    issue.updated_at = now
+                    doc_ref = issues_ref.document()
+                    batch.set(doc_ref, issue.to_dict())
+                    activity = Activity(type=ActivityType.CREATED, user_id=issue.reporter_id, created_at=now)
+                    batch.set(doc_ref.collection("activities").document(), activity.to_dict())
+                    doc_refs.append(doc_ref)
+                batch.commit()
+                
+                for issue, doc_ref in zip(chunk, doc_refs):
+                    issue.id = doc_ref.id
+                    issue_ids.append(doc_ref.id)
+            except Exception as e:
+                logger.error(f"Failed to create batch of {len(chunk)} issues: {e}")
+                issue_ids.extend([None] * len(chunk))
+        return issue_ids
+    
     def get_issue(self, issue_id: str) -> Optional[Issue]:
         """Get issue by ID"""
         if not self.db:
@@ -198,7 +263,8 @@ class FirebaseHelper:
             
             # Track changes for activity log
             for key, new_value in changes.items():
-                old_value = current_data.get(key)
+                # Compare against the stored (camelCase) field, e.g. assigneeId for assignee_id
+                old_value = current_data.get(self._map_field_name(key))
                 if old_value != new_value:
                     # Convert enum to value if needed
                     if isinstance(new_value, (IssueStatus, IssuePriority, IssueType)):
@@ -220,10 +286,10 @@ class FirebaseHelper:
             
             update_data["updatedAt"] = datetime.now()
             
-            # If status changed to resolved, set resolved_at
-            if "status" in changes and changes["status"] == IssueStatus.RESOLVED:
+            # If status changed to resolved, set resolved_at (an already-resolved issue keeps its timestamp)
+            if "status" in update_data and changes["status"] == IssueStatus.RESOLVED:
                 update_data["resolvedAt"] = datetime.now()
-            elif "status" in changes and current_data.get("status") == "resolved" and changes["status"] != IssueStatus.RESOLVED:
+            elif "status" in update_data and current_data.get("status") == "resolved":
                 update_data["resolvedAt"] = None
             
             issue_ref.update(update_data)
@@ -276,6 +342,34 @@ class FirebaseHelper:
             logger.error(f"Failed to list issues: {e}")
             return []
     
+    def count_issues_by_status(self) -> Dict[str, int]:
+        """
+        Count issues per status with Firestore aggregation queries (no documents are read).
+        
+        Returns:
+            Counts keyed by status value, plus "total" for all issues. Empty if unavailable.
+        """
+        if not self.db:
+            return {}
+        
+        try:
+            issues_ref = self.db.collection("issues")
+            queries = {"total": issues_ref}
+            for status in IssueStatus:
+                queries[status.value] = issues_ref.where("status", "==", status.value)
+            
+            futures = {key: _COUNT_POOL.submit(self._count, query) for key, query in queries.items()}
+            return {key: future.result() for key, future in futures.items()}
+        except Exception as e:
+            logger.error(f"Failed to count issues: {e}")
+            return {}
+    
+    @staticmethod
+    def _count(query) -> int:
+        """Run a count() aggregation for a query"""
+        result = query.count(alias="count").get()
+        return result[0][0].value
+    
     def delete_issue(self, issue_id: str) -> bool:
         """Delete issue (and its subcollections)"""
         if not self.db:
@@ -316,6 +410,7 @@ class FirebaseHelper:
             comments_ref = issue_ref.collection("comments")
             doc_ref = comments_ref.add(comment.to_dict())
             comment_id = doc_ref[1].id
+            comment.id = comment_id  # Set the ID for the comment
             
             # Create activity log
             self.create_activity(
@@ -345,6 +440,21 @@ class FirebaseHelper:
             logger.error(f"Failed to get comments: {e}")
             return []
     
+    def get_comment(self, issue_id: str, comment_id: str) -> Optional[Comment]:
+        """Get a single comment by ID"""
+        if not self.db:
+            return None
+        
+        try:
+            comment_ref = self.db.collection("issues").document(issue_id).collection("comments").document(comment_id)
+            comment_doc = comment_ref.get()
+            if comment_doc.exists:
+                return Comment.from_dict(comment_id, comment_doc.to_dict())
+            return None
+        except Exception as e:
+            logger.error(f"Failed to get comment: {e}")
+            return None
+    
     # Activity operations
     def create_activity(self, issue_id: str, activity_type: ActivityType,
                        user_id: str, changes: Optional[List[Dict[str, Any]]] = None) -> Optional[str]:
@@ -485,7 +595,8 @@ class FirebaseHelper:
             
             # Track changes
             for key, new_value in changes.items():
-                old_value = current_data.get(key)
+                # Compare against the stored (camelCase) field, e.g. assigneeId for assignee_id
+                old_value = current_data.get(self._map_field_name(key))
                 if old_value != new_value:
                     # Convert enum to value if needed
                     if isinstance(new_value, BacklogCategory):
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+orjson-backed JSON provider for Flask
+
+Drop-in replacement for Flask's DefaultJSONProvider that keeps its output
+format (RFC 822 dates, sorted keys) while serializing with orjson.
+"""
+
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    # Fallback to Flask's stdlib json provider
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# Keyword arguments Flask passes for compact responses - equivalent to orjson's default output
+_COMPACT_KWARGS = {"separators": (",", ":")}
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes with orjson.
+
+    Datetimes are passed through to DefaultJSONProvider.default so responses
+    keep Flask's HTTP-date format. Calls with formatting options orjson does
+    not support (e.g. indent in debug mode) fall back to the stdlib path.
+    """
+
+    if ORJSON_AVAILABLE:
+        _options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SORT_KEYS
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as JSON to a string"""
+        if kwargs and kwargs != _COMPACT_KWARGS:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options).decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        """Deserialize data as JSON from a string or bytes"""
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
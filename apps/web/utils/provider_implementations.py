@@ -66,14 +66,22 @@ class FirebaseHelperProviderImpl:
         """Update user"""
         return self._firebase_helper.update_user(uid, **kwargs)
     
-    def list_users(self) -> List[User]:
-        """List all users"""
-        return self._firebase_helper.list_users()
+    def get_users_by_ids(self, uids: List[str]) -> Dict[str, User]:
+        """Get several users by UID in one batched read (missing users are left out)"""
+        return self._firebase_helper.get_users_by_ids(uids)
+    
+    def list_users(self, role: Optional[UserRole] = None, limit: Optional[int] = None) -> List[User]:
+        """List users, optionally filtered by role and capped at `limit`"""
+        return self._firebase_helper.list_users(role=role, limit=limit)
     
     def create_issue(self, issue: Issue) -> Optional[str]:
         """Create a new issue and return its ID"""
         return self._firebase_helper.create_issue(issue)
     
+    def create_issues_batch(self, issues: List[Issue]) -> List[Optional[str]]:
+        """Create several issues with batched writes and return their IDs in input order"""
+        return self._firebase_helper.create_issues_batch(issues)
+    
     def get_issue(self, issue_id: str) -> Optional[Issue]:
         """Get issue by ID"""
         return self._firebase_helper.get_issue(issue_id)
@@ -86,6 +94,10 @@ class FirebaseHelperProviderImpl:
         """List issues with optional filters"""
         return self._firebase_helper.list_issues(filters=filters, limit=limit)
     
+    def count_issues_by_status(self) -> Dict[str, int]:
+        """Count issues per status (plus "total") without reading the documents"""
+        return self._firebase_helper.count_issues_by_status()
+    
     def delete_issue(self, issue_id: str) -> bool:
         """Delete issue (and its subcollections)"""
         return self._firebase_helper.delete_issue(issue_id)
@@ -98,6 +110,10 @@ class FirebaseHelperProviderImpl:
         """Get all comments for an issue"""
         return self._firebase_helper.get_comments(issue_id)
     
+    def get_comment(self, issue_id: str, comment_id: str) -> Optional[Comment]:
+        """Get a single comment by ID"""
+        return self._firebase_helper.get_comment(issue_id, comment_id)
+    
     def create_activity(
         self,
         issue_id: str,
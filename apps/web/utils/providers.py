@@ -44,14 +44,22 @@ class FirebaseHelperProvider(Protocol):
         """Update user"""
         ...
     
-    def list_users(self) -> List[User]:
-        """List all users"""
+    def get_users_by_ids(self, uids: List[str]) -> Dict[str, User]:
+        """Get several users by UID in one batched read (missing users are left out)"""
+        ...
+    
+    def list_users(self, role: Optional[UserRole] = None, limit: Optional[int] = None) -> List[User]:
+        """List users, optionally filtered by role and capped at `limit`"""
         ...
     
     def create_issue(self, issue: Issue) -> Optional[str]:
         """Create a new issue and return its ID"""
         ...
     
+    def create_issues_batch(self, issues: List[Issue]) -> List[Optional[str]]:
+        """Create several issues with batched writes and return their IDs in input order"""
+        ...
+    
     def get_issue(self, issue_id: str) -> Optional[Issue]:
         """Get issue by ID"""
         ...
@@ -64,6 +72,10 @@ class FirebaseHelperProvider(Protocol):
         """List issues with optional filters"""
         ...
     
+    def count_issues_by_status(self) -> Dict[str, int]:
+        """Count issues per status (plus "total") without reading the documents"""
+        ...
+    
     def delete_issue(self, issue_id: str) -> bool:
         """Delete issue (and its subcollections)"""
         ...
@@ -76,6 +88,10 @@ class FirebaseHelperProvider(Protocol):
         """Get all comments for an issue"""
         ...
     
+    def get_comment(self, issue_id: str, comment_id: str) -> Optional[Comment]:
+        """Get a single comment by ID"""
+        ...
+    
     def create_activity(
         self,
         issue_id: str,
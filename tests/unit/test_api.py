@@ -11,6 +11,7 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock
 from flask import Flask
 from datetime import datetime
+from werkzeug.exceptions import TooManyRequests
 
 # Mock Flask extensions before any imports
 # Comment out sys.modules mocking to see actual issues
@@ -19,10 +20,19 @@ from datetime import datetime
 # sys.modules['flask_wtf.csrf'] = MagicMock()
 
 from apps.web.models import Issue, IssueStatus, IssuePriority, IssueType, Comment
+from apps.web.api import api_bp, _ensure_service_user
 
 
 @pytest.fixture
-def app():
+def firebase_provider():
+    """Mock Firebase provider injected through the app (same seam as create_app)."""
+    provider = Mock()
+    provider.is_available.return_value = True
+    return provider
+
+
+@pytest.fixture
+def app(firebase_provider):
     """Create Flask app for testing."""
     # Create a minimal Flask app
     app = Flask(__name__)
@@ -30,15 +40,10 @@ def app():
     app.config['SECRET_KEY'] = 'test-secret-key'
     app.config['WTF_CSRF_ENABLED'] = False
     
-    # Mock limiter decorator
-    mock_limiter = Mock()
-    mock_limiter.limit.return_value = lambda f: f
+    app.register_blueprint(api_bp)
     
-    # Register API routes manually (avoiding blueprint import issues)
-    with patch('apps.web.extensions.limiter', mock_limiter):
-        with patch('apps.web.api.firebase_helper'):
-            from apps.web.api import api_bp
-            app.register_blueprint(api_bp)
+    # Inject provider the same way create_app does
+    app.firebase_helper_provider = firebase_provider
     
     return app
 
@@ -49,13 +54,29 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture
+def issue_publisher():
+    """Mock alphafusion issue publisher (provided by alphafusion-core at runtime)."""
+    publisher = Mock()
+    publisher.is_available.return_value = True
+    publisher.publish_issue.return_value = True
+    publisher_module = MagicMock()
+    publisher_module.get_issue_publisher.return_value = publisher
+    modules = {
+        'alphafusion': MagicMock(),
+        'alphafusion.utils': MagicMock(),
+        'alphafusion.utils.issue_publisher': publisher_module,
+    }
+    with patch.dict(sys.modules, modules):
+        yield publisher
+
+
 class TestHealthCheck:
     """Tests for health check endpoint."""
     
-    @patch('apps.web.api.firebase_helper')
-    def test_health_check_available(self, mock_firebase_helper, client):
+    def test_health_check_available(self, firebase_provider, client):
         """Test health check when Firebase is available."""
-        mock_firebase_helper.is_available.return_value = True
+        firebase_provider.is_available.return_value = True
         
         response = client.get('/api/health')
         
@@ -64,10 +85,9 @@ class TestHealthCheck:
         assert data['status'] == 'healthy'
         assert data['firebase_available'] is True
     
-    @patch('apps.web.api.firebase_helper')
-    def test_health_check_unavailable(self, mock_firebase_helper, client):
+    def test_health_check_unavailable(self, firebase_provider, client):
         """Test health check when Firebase is unavailable."""
-        mock_firebase_helper.is_available.return_value = False
+        firebase_provider.is_available.return_value = False
         
         response = client.get('/api/health')
         
@@ -80,24 +100,10 @@ class TestHealthCheck:
 class TestCreateIssue:
     """Tests for create issue endpoint."""
     
-    @patch('apps.web.api.firebase_helper')
-    def test_create_issue_success(self, mock_firebase_helper, client):
-        """Test successful issue creation."""
-        # Mock Firebase helper
-        mock_issue = Issue(
-            id="test-123",
-            title="Test Issue",
-            description="Test description",
-            status=IssueStatus.OPEN,
-            priority=IssuePriority.HIGH,
-            type=IssueType.BUG,
-            reporter_id="user1",
-            created_at=datetime.now()
-        )
-        mock_firebase_helper.create_issue.return_value = "test-123"
-        mock_firebase_helper.get_issue.return_value = mock_issue
-        mock_firebase_helper.get_user.return_value = None  # User doesn't exist
-        mock_firebase_helper.create_user.return_value = Mock()  # Auto-create user
+    def test_create_issue_success(self, firebase_provider, issue_publisher, client):
+        """Test successful issue creation (published to Kafka)."""
+        firebase_provider.get_user.return_value = None  # User doesn't exist
+        firebase_provider.create_user.return_value = Mock()  # Auto-create user
         
         data = {
             "title": "Test Issue",
@@ -109,14 +115,47 @@ class TestCreateIssue:
         
         response = client.post('/api/v1/issues', json=data)
         
-        assert response.status_code == 201
+        assert response.status_code == 202
         result = response.get_json()
-        assert result['id'] == "test-123"
+        assert result['id'].startswith("temp-")
         assert result['title'] == "Test Issue"
         assert result['status'] == "open"
         assert result['priority'] == "high"
         assert result['type'] == "bug"
-    
+        issue_publisher.publish_issue.assert_called_once()
+
+    def test_create_issue_self_assigned_checks_user_once(self, firebase_provider, issue_publisher, client):
+        """Test the service user check is not repeated when reporter and assignee match."""
+        data = {
+            "title": "Test Issue",
+            "description": "Test description",
+            "reporter_id": "service-a",
+            "assignee_id": "service-a"
+        }
+
+        with patch('apps.web.api._IO_POOL') as io_pool:
+            response = client.post('/api/v1/issues', json=data)
+
+        assert response.status_code == 202
+        io_pool.submit.assert_called_once()
+
+    def test_create_issue_waits_for_service_user(self, firebase_provider, issue_publisher, client):
+        """Test the reporter is created before the issue is published."""
+        firebase_provider.get_user.return_value = None
+        issue_publisher.publish_issue.side_effect = (
+            lambda **kwargs: firebase_provider.create_user.called
+        )
+
+        data = {
+            "title": "Test Issue",
+            "description": "Test description",
+            "reporter_id": "service-wait"
+        }
+
+        response = client.post('/api/v1/issues', json=data)
+
+        assert response.status_code == 202
+
     def test_create_issue_invalid_data(self, client):
         """Test issue creation with invalid data."""
         data = {
@@ -129,12 +168,11 @@ class TestCreateIssue:
         assert response.status_code == 400
         assert 'error' in response.get_json()
     
-    @patch('apps.web.api.firebase_helper')
-    def test_create_issue_firebase_error(self, mock_firebase_helper, client):
-        """Test issue creation when Firebase fails."""
-        mock_firebase_helper.create_issue.return_value = None
-        mock_firebase_helper.get_user.return_value = None
-        mock_firebase_helper.create_user.return_value = Mock()
+    def test_create_issue_publish_error(self, firebase_provider, issue_publisher, client):
+        """Test issue creation when publishing to Kafka fails."""
+        issue_publisher.publish_issue.return_value = False
+        firebase_provider.get_user.return_value = None
+        firebase_provider.create_user.return_value = Mock()
         
         data = {
             "title": "Test Issue",
@@ -144,15 +182,14 @@ class TestCreateIssue:
         
         response = client.post('/api/v1/issues', json=data)
         
-        assert response.status_code == 500
+        assert response.status_code == 503
         assert 'error' in response.get_json()
 
 
 class TestGetIssue:
     """Tests for get issue endpoint."""
     
-    @patch('apps.web.api.firebase_helper')
-    def test_get_issue_success(self, mock_firebase_helper, client):
+    def test_get_issue_success(self, firebase_provider, client):
         """Test successful issue retrieval."""
         mock_issue = Issue(
             id="test-123",
@@ -164,7 +201,7 @@ class TestGetIssue:
             reporter_id="user1",
             created_at=datetime.now()
         )
-        mock_firebase_helper.get_issue.return_value = mock_issue
+        firebase_provider.get_issue.return_value = mock_issue
         
         response = client.get('/api/v1/issues/test-123')
         
@@ -173,22 +210,40 @@ class TestGetIssue:
         assert data['id'] == "test-123"
         assert data['title'] == "Test Issue"
     
-    @patch('apps.web.api.firebase_helper')
-    def test_get_issue_not_found(self, mock_firebase_helper, client):
+    def test_get_issue_not_found(self, firebase_provider, client):
         """Test getting non-existent issue."""
-        mock_firebase_helper.get_issue.return_value = None
+        firebase_provider.get_issue.return_value = None
         
         response = client.get('/api/v1/issues/nonexistent')
-        
+
         assert response.status_code == 404
         assert 'error' in response.get_json()
 
+    def test_get_issue_provider_error(self, firebase_provider, client):
+        """Test unexpected provider errors are returned as a generic 500."""
+        firebase_provider.get_issue.side_effect = RuntimeError("firestore down")
+
+        response = client.get('/api/v1/issues/test-123')
+
+        assert response.status_code == 500
+        assert response.get_json() == {"error": "Internal server error"}
+
+    def test_get_issue_rate_limited(self, firebase_provider, client):
+        """Test HTTP errors raised in API handlers are returned as JSON with their headers."""
+        firebase_provider.get_issue.side_effect = TooManyRequests(retry_after=30)
+
+        response = client.get('/api/v1/issues/test-123')
+
+        assert response.status_code == 429
+        assert response.is_json
+        assert 'error' in response.get_json()
+        assert response.headers["Retry-After"] == "30"
+
 
 class TestUpdateIssue:
     """Tests for update issue endpoint."""
     
-    @patch('apps.web.api.firebase_helper')
-    def test_update_issue_success(self, mock_firebase_helper, client):
+    def test_update_issue_success(self, firebase_provider, client):
         """Test successful issue update."""
         mock_issue = Issue(
             id="test-123",
@@ -200,8 +255,8 @@ class TestUpdateIssue:
             reporter_id="user1",
             created_at=datetime.now()
         )
-        mock_firebase_helper.get_issue.return_value = mock_issue
-        mock_firebase_helper.update_issue.return_value = True
+        firebase_provider.get_issue.return_value = mock_issue
+        firebase_provider.update_issue.return_value = True
         
         data = {
             "status": "in-progress",
@@ -215,12 +270,71 @@ class TestUpdateIssue:
         )
         
         assert response.status_code == 200
-        mock_firebase_helper.update_issue.assert_called_once()
-    
-    @patch('apps.web.api.firebase_helper')
-    def test_update_issue_not_found(self, mock_firebase_helper, client):
+        firebase_provider.update_issue.assert_called_once()
+
+    def test_update_issue_status_invalidates_dashboard_counts(self, app, firebase_provider, client):
+        """Test a status change through the API drops the cached dashboard counts."""
+        firebase_provider.get_issue.return_value = Issue(
+            id="test-123",
+            title="Test Issue",
+            description="Test description",
+            status=IssueStatus.OPEN,
+            reporter_id="user1"
+        )
+        firebase_provider.update_issue.return_value = True
+        app.issue_counts_cache = (0.0, {"total": 1, "open": 1})
+
+        response = client.patch('/api/v1/issues/test-123', json={"status": "resolved"})
+
+        assert response.status_code == 200
+        assert app.issue_counts_cache is None
+
+    def test_update_issue_no_changes_keeps_updated_at(self, firebase_provider, client):
+        """Test a PATCH that changes nothing does not touch updated_at."""
+        updated_at = datetime(2024, 1, 1, 12, 0, 0)
+        issue = Issue(
+            id="test-123",
+            title="Test Issue",
+            description="Test description",
+            status=IssueStatus.OPEN,
+            reporter_id="user1",
+            updated_at=updated_at
+        )
+        firebase_provider.get_issue.return_value = issue
+        firebase_provider.update_issue.return_value = True
+
+        response = client.patch('/api/v1/issues/test-123', json={"status": "open"})
+
+        assert response.status_code == 200
+        assert issue.updated_at == updated_at
+
+    def test_update_issue_already_resolved_keeps_resolved_at(self, firebase_provider, client):
+        """Test re-sending the resolved status does not move resolved_at."""
+        resolved_at = datetime(2024, 1, 1, 12, 0, 0)
+        issue = Issue(
+            id="test-123",
+            title="Test Issue",
+            description="Test description",
+            status=IssueStatus.RESOLVED,
+            reporter_id="user1",
+            resolved_at=resolved_at
+        )
+        firebase_provider.get_issue.return_value = issue
+        firebase_provider.update_issue.return_value = True
+
+        response = client.patch(
+            '/api/v1/issues/test-123',
+            json={"status": "resolved", "title": "Renamed"}
+        )
+
+        assert response.status_code == 200
+        assert response.get_json()["title"] == "Renamed"
+        assert issue.resolved_at == resolved_at
+        assert issue.updated_at is not None
+
+    def test_update_issue_not_found(self, firebase_provider, client):
         """Test updating non-existent issue."""
-        mock_firebase_helper.get_issue.return_value = None
+        firebase_provider.get_issue.return_value = None
         
         data = {"status": "in-progress"}
         
@@ -236,8 +350,7 @@ class TestUpdateIssue:
 class TestAddComment:
     """Tests for add comment endpoint."""
     
-    @patch('apps.web.api.firebase_helper')
-    def test_add_comment_success(self, mock_firebase_helper, client):
+    def test_add_comment_success(self, firebase_provider, client):
         """Test successful comment addition."""
         mock_issue = Issue(
             id="test-123",
@@ -246,10 +359,10 @@ class TestAddComment:
             reporter_id="user1",
             created_at=datetime.now()
         )
-        mock_firebase_helper.get_issue.return_value = mock_issue
-        mock_firebase_helper.create_comment.return_value = "comment-123"
-        mock_firebase_helper.get_user.return_value = None
-        mock_firebase_helper.create_user.return_value = Mock()
+        firebase_provider.get_issue.return_value = mock_issue
+        firebase_provider.create_comment.return_value = "comment-123"
+        firebase_provider.get_user.return_value = None
+        firebase_provider.create_user.return_value = Mock()
         
         data = {
             "content": "Test comment",
@@ -263,10 +376,9 @@ class TestAddComment:
         assert result['id'] == "comment-123"
         assert result['content'] == "Test comment"
     
-    @patch('apps.web.api.firebase_helper')
-    def test_add_comment_issue_not_found(self, mock_firebase_helper, client):
+    def test_add_comment_issue_not_found(self, firebase_provider, client):
         """Test adding comment to non-existent issue."""
-        mock_firebase_helper.get_issue.return_value = None
+        firebase_provider.get_issue.return_value = None
         
         data = {
             "content": "Test comment",
@@ -281,8 +393,7 @@ class TestAddComment:
 class TestGetComments:
     """Tests for get comments endpoint."""
     
-    @patch('apps.web.api.firebase_helper')
-    def test_get_comments_success(self, mock_firebase_helper, client):
+    def test_get_comments_success(self, firebase_provider, client):
         """Test successful comment retrieval."""
         mock_comments = [
             Comment(
@@ -300,7 +411,7 @@ class TestGetComments:
                 created_at=datetime.now()
             )
         ]
-        mock_firebase_helper.get_comments.return_value = mock_comments
+        firebase_provider.get_comments.return_value = mock_comments
         
         response = client.get('/api/v1/issues/test-123/comments')
         
@@ -310,3 +421,40 @@ class TestGetComments:
         assert data['comments'][0]['id'] == "comment-1"
         assert data['comments'][1]['id'] == "comment-2"
 
+
+class TestEnsureServiceUser:
+    """Tests for the known-users cache behind _ensure_service_user."""
+    
+    @pytest.fixture(autouse=True)
+    def known_users(self):
+        """Start each test with an empty known-users cache."""
+        with patch('apps.web.api._known_users', set()) as known_users:
+            yield known_users
+    
+    def test_known_user_skips_lookup(self, firebase_provider):
+        """Test a repeated uid is not looked up in Firebase again."""
+        firebase_provider.get_user.return_value = Mock()
+        
+        _ensure_service_user(firebase_provider, "service-a")
+        _ensure_service_user(firebase_provider, "service-a")
+        
+        firebase_provider.get_user.assert_called_once_with("service-a")
+    
+    def test_created_user_remembered(self, firebase_provider, known_users):
+        """Test an auto-created service user is remembered."""
+        firebase_provider.get_user.return_value = None
+        firebase_provider.create_user.return_value = Mock()
+        
+        _ensure_service_user(firebase_provider, "service-a")
+        
+        assert "service-a" in known_users
+    
+    def test_cache_bounded(self, firebase_provider, known_users):
+        """Test the cache is reset once it reaches its bound."""
+        firebase_provider.get_user.return_value = Mock()
+        
+        with patch('apps.web.api._KNOWN_USERS_MAX', 2):
+            for uid in ("service-a", "service-b", "service-c"):
+                _ensure_service_user(firebase_provider, uid)
+        
+        assert known_users == {"service-c"}
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Unit tests for app-level error handlers.
+"""
+
+import sys
+import pytest
+from unittest.mock import Mock, MagicMock, patch
+from flask import Flask
+from apps.web.api import api_bp
+from apps.web import app as app_module
+from apps.web.app import configure_app, register_error_handlers, _TEMPLATES_DIR
+
+
+@pytest.fixture
+def app():
+    """Create a Flask app with the API blueprint and the app error handlers."""
+    app = Flask(__name__, template_folder=_TEMPLATES_DIR)
+    app.config['TESTING'] = True
+    app.firebase_helper_provider = Mock()
+    app.register_blueprint(api_bp)
+    register_error_handlers(app)
+    
+    @app.route("/page")
+    def page():
+        return "ok"
+    
+    @app.route("/boom")
+    def boom():
+        raise RuntimeError("boom")
+    
+    return app
+
+
+@pytest.fixture
+def client(app):
+    """Create test client."""
+    return app.test_client()
+
+
+class TestApiErrors:
+    """Tests for errors on API routes."""
+    
+    def test_method_not_allowed_returns_json(self, client):
+        """Test a 405 on an API route is JSON and keeps the Allow header."""
+        response = client.delete('/api/health')
+        
+        assert response.status_code == 405
+        assert response.is_json
+        assert 'error' in response.get_json()
+        assert "GET" in response.headers["Allow"]
+
+
+class TestErrorHandlers:
+    """Tests for the JSON/HTML error responses."""
+    
+    def test_not_found_json_for_api(self, client):
+        """Test a 404 under /api/ is JSON without an error ID."""
+        response = client.get('/api/missing')
+        
+        assert response.status_code == 404
+        assert response.get_json() == {"error": "Not found"}
+    
+    def test_not_found_html_for_pages(self, client):
+        """Test a 404 on a page renders the 404 template."""
+        with patch('apps.web.app.render_template', return_value="not found page") as render:
+            response = client.get('/missing')
+        
+        assert response.status_code == 404
+        assert response.data == b"not found page"
+        render.assert_called_once_with('404.html')
+    
+    def test_unhandled_error_json_has_error_id(self, client):
+        """Test an unhandled error on a JSON request returns 500 with an error ID."""
+        response = client.get('/boom', headers={"Content-Type": "application/json"})
+        
+        assert response.status_code == 500
+        data = response.get_json()
+        assert data["error"] == "An internal error occurred"
+        assert data["error_id"]
+    
+    def test_unhandled_error_html_has_error_id(self, client):
+        """Test an unhandled error on a page renders the 500 template with an error ID."""
+        with patch('apps.web.app.render_template', return_value="error page") as render:
+            response = client.get('/boom')
+        
+        assert response.status_code == 500
+        assert render.call_args[0] == ('500.html',)
+        assert render.call_args[1]["error_id"]
+    
+    def test_method_not_allowed_passes_through_for_pages(self, client):
+        """Test a 405 on a page keeps werkzeug's default response."""
+        response = client.post('/page')
+        
+        assert response.status_code == 405
+        assert response.mimetype == "text/html"
+        assert "GET" in response.headers["Allow"]
+
+
+class TestConfigureApp:
+    """Tests for configuration loading."""
+    
+    @staticmethod
+    def configure(monkeypatch, flask_debug, **env):
+        """Run configure_app against a stubbed config store and environment."""
+        monkeypatch.delenv("SESSION_COOKIE_SECURE", raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        values = {
+            "app/issuetracker/secret_key": "x" * 32,
+            "app/issuetracker/flask_debug": flask_debug,
+            "app/issuetracker/flask_port": 6001,
+        }
+        app = Flask(__name__)
+        with patch('apps.web.app._get_config_value', side_effect=lambda path, **kwargs: values[path]):
+            configure_app(app)
+        return app
+    
+    def test_string_debug_flag_coerced(self, monkeypatch):
+        """Test a "False" string from the config store is not treated as debug."""
+        app = self.configure(monkeypatch, "False")
+        
+        assert app.config['FLASK_DEBUG'] is False
+        assert app.config['TEMPLATES_AUTO_RELOAD'] is False
+        assert app.config['SESSION_COOKIE_SECURE'] is True
+    
+    def test_session_cookie_secure_outside_debug(self, monkeypatch):
+        """Test session cookies are secure, HttpOnly and SameSite=Lax outside debug."""
+        app = self.configure(monkeypatch, False)
+        
+        assert app.config['SESSION_COOKIE_SECURE'] is True
+        assert app.config['SESSION_COOKIE_HTTPONLY'] is True
+        assert app.config['SESSION_COOKIE_SAMESITE'] == 'Lax'
+    
+    def test_debug_allows_insecure_session_cookie(self, monkeypatch):
+        """Test secure session cookies are not forced in debug mode."""
+        app = self.configure(monkeypatch, True)
+        
+        assert app.config['SESSION_COOKIE_SECURE'] is False
+    
+    def test_explicit_session_cookie_setting_kept(self, monkeypatch):
+        """Test SESSION_COOKIE_SECURE from the environment wins over the debug default."""
+        app = self.configure(monkeypatch, False, SESSION_COOKIE_SECURE="false")
+        
+        assert app.config['SESSION_COOKIE_SECURE'] is False
+
+
+class TestGetConfigValue:
+    """Tests for the memoized config store lookup."""
+    
+    @pytest.fixture(autouse=True)
+    def config_helper(self):
+        """Stub alphafusion's config helper and start each test with an empty cache."""
+        helper = MagicMock()
+        modules = {
+            'alphafusion': MagicMock(),
+            'alphafusion.config': MagicMock(),
+            'alphafusion.config.config_helper': helper,
+        }
+        with patch.dict(sys.modules, modules), patch.dict(app_module._config_cache, clear=True):
+            yield helper
+    
+    def test_value_cached(self, config_helper):
+        """Test a loaded value is served from the cache afterwards."""
+        config_helper.get_config_value.return_value = "secret"
+        
+        assert app_module._get_config_value("app/key") == "secret"
+        assert app_module._get_config_value("app/key") == "secret"
+        config_helper.get_config_value.assert_called_once_with("app/key")
+    
+    def test_empty_value_not_cached(self, config_helper):
+        """Test an empty result (e.g. store unavailable at boot) is retried on the next call."""
+        config_helper.get_config_value.side_effect = [None, "secret"]
+        
+        assert app_module._get_config_value("app/key") is None
+        assert app_module._get_config_value("app/key") == "secret"
@@ -78,6 +78,21 @@ class TestAuthHelpers:
             
             assert session.get("user_id") == "user123"
     
+    @patch('apps.web.auth._LOGIN_UPDATE_POOL')
+    def test_login_user_updates_last_login_in_background(self, mock_pool):
+        """Test the last-login write is handed to the background pool."""
+        app = Flask(__name__)
+        app.secret_key = "test-secret"
+        app.firebase_helper_provider = Mock()
+        
+        with app.test_request_context():
+            login_user("user123")
+        
+        app.firebase_helper_provider.update_user.assert_not_called()
+        mock_pool.submit.assert_called_once_with(
+            app.firebase_helper_provider.update_user, "user123", last_login=None
+        )
+    
     def test_logout_user(self):
         """Test logging out a user."""
         app = Flask(__name__)
@@ -88,6 +103,18 @@ class TestAuthHelpers:
             logout_user()
             
             assert session.get("user_id") is None
+    
+    def test_current_user_id_follows_login_and_logout(self):
+        """Test the per-request user ID cache is updated by login/logout."""
+        app = Flask(__name__)
+        app.secret_key = "test-secret"
+        
+        with app.test_request_context():
+            assert get_current_user_id() is None
+            login_user("user123")
+            assert get_current_user_id() == "user123"
+            logout_user()
+            assert get_current_user_id() is None
 
 
 class TestRequireAuth:
@@ -128,7 +155,45 @@ class TestRequireAuth:
         with app.test_client() as client:
             response = client.get("/test", follow_redirects=False)
             assert response.status_code == 302  # Redirect to login
-    
+
+    def test_require_auth_redirect_url_built_once(self):
+        """Test the landing URL is resolved once and reused across requests."""
+        app = Flask(__name__)
+        app.secret_key = "test-secret"
+
+        @app.route("/", endpoint="landing")
+        def landing():
+            return "landing"
+
+        @app.route("/test")
+        @require_auth
+        def test_route():
+            return "success"
+
+        with app.test_client() as client:
+            with patch("apps.web.auth.url_for", return_value="/") as mock_url_for:
+                first = client.get("/test", follow_redirects=False)
+                second = client.get("/test", follow_redirects=False)
+
+        assert first.headers["Location"] == second.headers["Location"] == "/"
+        mock_url_for.assert_called_once_with("landing")
+
+    def test_require_auth_missing_landing_endpoint_logged(self, caplog):
+        """Test a missing landing endpoint is logged rather than silently redirected to '/'."""
+        app = Flask(__name__)
+        app.secret_key = "test-secret"
+
+        @app.route("/test")
+        @require_auth
+        def test_route():
+            return "success"
+
+        with app.test_client() as client:
+            response = client.get("/test", follow_redirects=False)
+
+        assert response.headers["Location"] == "/"
+        assert "Cannot build landing page URL" in caplog.text
+
     def test_require_auth_not_authenticated_api(self):
         """Test require_auth returns 401 for API requests."""
         app = Flask(__name__)
@@ -205,3 +270,41 @@ class TestRequireRole:
             assert response.status_code == 403
             assert b"Insufficient permissions" in response.data
 
+
+
+class TestEnsureDefaultAdmin:
+    """Tests for ensure_default_admin."""
+    
+    @pytest.fixture
+    def app(self):
+        """Fresh app per test, so the admin-ensured flag on app.extensions starts unset."""
+        app = Flask(__name__)
+        app.firebase_helper_provider = Mock()
+        app.firebase_helper_provider.get_user.return_value = User(
+            uid="admin",
+            email="admin@alphafusion.local",
+            role=UserRole.ADMIN
+        )
+        return app
+    
+    def test_checked_once_per_app(self, app):
+        """Test repeat calls for the same app skip the admin lookup."""
+        with app.app_context():
+            ensure_default_admin()
+            ensure_default_admin()
+        
+        app.firebase_helper_provider.get_user.assert_called_once_with("admin")
+    
+    def test_each_app_checked(self, app):
+        """Test a second app (with its own provider) still runs the check."""
+        other = Flask(__name__)
+        other.firebase_helper_provider = Mock()
+        other.firebase_helper_provider.get_user.return_value = None
+        other.firebase_helper_provider.list_users.return_value = []
+        
+        with app.app_context():
+            ensure_default_admin()
+        with other.app_context():
+            ensure_default_admin()
+        
+        other.firebase_helper_provider.create_user.assert_called_once()
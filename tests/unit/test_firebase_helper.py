@@ -87,6 +87,26 @@ class TestFirebaseHelper:
         assert user.email == "user1@example.com"
         assert user.role == UserRole.DEVELOPER
     
+    @patch('apps.web.utils.firebase_helper.firestore')
+    def test_list_users_by_role(self, mock_firestore):
+        """Test listing users filtered by role queries Firestore instead of scanning."""
+        helper = FirebaseHelper()
+        helper.db = Mock()
+        
+        mock_collection = Mock()
+        mock_query = mock_collection.where.return_value.limit.return_value
+        mock_query.stream.return_value = [
+            Mock(id="admin", to_dict=lambda: {"email": "admin@alphafusion.local", "role": "admin"})
+        ]
+        helper.db.collection.return_value = mock_collection
+        
+        users = helper.list_users(role=UserRole.ADMIN, limit=1)
+        
+        mock_collection.where.assert_called_once_with("role", "==", "admin")
+        mock_collection.where.return_value.limit.assert_called_once_with(1)
+        assert [user.uid for user in users] == ["admin"]
+        assert users[0].role == UserRole.ADMIN
+    
     @patch('apps.web.utils.firebase_helper.firestore')
     def test_create_issue(self, mock_firestore):
         """Test creating an issue."""
@@ -111,6 +131,30 @@ class TestFirebaseHelper:
         assert issue_id == "issue-123"
         mock_collection.add.assert_called_once()
     
+    @patch('apps.web.utils.firebase_helper.firestore')
+    def test_create_issues_batch(self, mock_firestore):
+        """Test creating issues with a single batched write."""
+        helper = FirebaseHelper()
+        helper.db = Mock()
+        
+        mock_collection = Mock()
+        mock_collection.document.side_effect = [Mock(id="issue-1"), Mock(id="issue-2")]
+        helper.db.collection.return_value = mock_collection
+        mock_batch = helper.db.batch.return_value
+        
+        issues = [
+            Issue(title="First", reporter_id="user1"),
+            Issue(title="Second", reporter_id="user2"),
+        ]
+        
+        issue_ids = helper.create_issues_batch(issues)
+        
+        assert issue_ids == ["issue-1", "issue-2"]
+        assert [issue.id for issue in issues] == ["issue-1", "issue-2"]
+        assert mock_batch.set.call_count == 4  # issue + CREATED activity each
+        mock_batch.commit.assert_called_once()
+        mock_collection.add.assert_not_called()
+    
     @patch('apps.web.utils.firebase_helper.firestore')
     def test_get_issue(self, mock_firestore):
         """Test getting an issue."""
@@ -180,6 +224,56 @@ class TestFirebaseHelper:
         assert issues[0].title == "Issue 1"
         assert issues[1].title == "Issue 2"
     
+    def test_get_users_by_ids(self):
+        """Test users are fetched with one batched read and missing users are skipped."""
+        helper = FirebaseHelper()
+        helper.db = Mock()
+        
+        found = Mock(id="user1", exists=True)
+        found.to_dict.return_value = {"email": "user1@example.com", "role": "developer"}
+        helper.db.get_all.return_value = [found, Mock(id="ghost", exists=False)]
+        
+        users = helper.get_users_by_ids(["user1", "ghost"])
+        
+        assert list(users) == ["user1"]
+        assert users["user1"].role == UserRole.DEVELOPER
+        helper.db.get_all.assert_called_once()
+    
+    def test_update_issue_unchanged_assignee(self):
+        """Test an unchanged assignee is compared against the camelCase field and not written."""
+        helper = FirebaseHelper()
+        helper.db = Mock()
+        helper.create_activity = Mock()
+        
+        issue_ref = helper.db.collection.return_value.document.return_value
+        issue_ref.get.return_value = Mock(exists=True)
+        issue_ref.get.return_value.to_dict.return_value = {"status": "open", "assigneeId": "user2"}
+        
+        assert helper.update_issue("issue1", {"assignee_id": "user2"}, "user1") is True
+        issue_ref.update.assert_not_called()
+        helper.create_activity.assert_not_called()
+    
+    def test_count_issues_by_status(self):
+        """Test per-status counts use count aggregations instead of streaming documents."""
+        helper = FirebaseHelper()
+        helper.db = Mock()
+        
+        counts = {"open": 3, "in-progress": 2, "resolved": 5, "closed": 1}
+        
+        def count_query(value):
+            query = Mock()
+            query.count.return_value.get.return_value = [[Mock(value=value)]]
+            return query
+        
+        mock_collection = count_query(11)
+        mock_collection.where.side_effect = lambda field, op, value: count_query(counts[value])
+        helper.db.collection.return_value = mock_collection
+        
+        result = helper.count_issues_by_status()
+        
+        assert result == {"total": 11, **counts}
+        mock_collection.stream.assert_not_called()
+    
     @patch('apps.web.utils.firebase_helper.firestore')
     def test_add_comment(self, mock_firestore):
         """Test adding a comment."""
@@ -216,6 +310,7 @@ class TestFirebaseHelper:
         comment_id = helper.create_comment("issue-123", comment)
         
         assert comment_id == "comment-123"
+        assert comment.id == "comment-123"
         # Should be called twice: once for comment, once for activity
         assert mock_comments_collection.add.call_count == 1
     
@@ -254,4 +349,29 @@ class TestFirebaseHelper:
         assert len(comments) == 2
         assert comments[0].content == "Comment 1"
         assert comments[1].content == "Comment 2"
-
+    
+    @patch('apps.web.utils.firebase_helper.firestore')
+    def test_get_comment(self, mock_firestore):
+        """Test getting a single comment."""
+        helper = FirebaseHelper()
+        helper.db = Mock()
+        
+        mock_comment_doc = Mock()
+        mock_comment_doc.get.return_value.exists = True
+        mock_comment_doc.get.return_value.to_dict.return_value = {
+            "issueId": "issue-123",
+            "authorId": "user1",
+            "content": "Comment 1",
+            "createdAt": datetime.now().isoformat()
+        }
+        mock_issue_doc = Mock()
+        mock_issue_doc.collection.return_value.document.return_value = mock_comment_doc
+        helper.db.collection.return_value.document.return_value = mock_issue_doc
+        
+        comment = helper.get_comment("issue-123", "comment-1")
+        
+        assert comment is not None
+        assert comment.id == "comment-1"
+        assert comment.content == "Comment 1"
+        mock_issue_doc.collection.assert_called_once_with("comments")
+        mock_issue_doc.collection.return_value.document.assert_called_once_with("comment-1")
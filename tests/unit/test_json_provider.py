@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the orjson JSON provider.
+"""
+
+import pytest
+from datetime import datetime
+from flask import Flask, jsonify
+from apps.web.utils.json_provider import OrjsonProvider, ORJSON_AVAILABLE
+
+pytestmark = pytest.mark.skipif(not ORJSON_AVAILABLE, reason="orjson not installed")
+
+
+@pytest.fixture
+def app():
+    """Create Flask app using the orjson provider."""
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    return app
+
+
+class TestOrjsonProvider:
+    """Tests for OrjsonProvider."""
+    
+    def test_matches_default_provider_output(self, app):
+        """Test that responses match Flask's stdlib provider (sorted keys, HTTP dates)."""
+        payload = {"b": 1, "a": datetime(2024, 1, 1, 12, 0, 0), "c": [None, 1.5]}
+        default_app = Flask(__name__)
+        
+        with default_app.app_context():
+            expected = jsonify(payload).get_json()
+        with app.app_context():
+            response = jsonify(payload)
+        
+        assert response.get_data(as_text=True).startswith('{"a":')
+        assert response.get_json() == expected
+        assert response.get_json()["a"] == "Mon, 01 Jan 2024 12:00:00 GMT"
+    
+    def test_indent_falls_back_to_stdlib(self, app):
+        """Test that formatting options orjson doesn't support use the stdlib path."""
+        with app.app_context():
+            assert app.json.dumps({"a": 1}, indent=2) == '{\n  "a": 1\n}'
+    
+    def test_loads(self, app):
+        """Test deserializing JSON."""
+        with app.app_context():
+            assert app.json.loads(b'{"x": [1, 2]}') == {"x": [1, 2]}
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the issue tracker Kafka consumer.
+"""
+
+import sys
+import threading
+import time
+
+import pytest
+from unittest.mock import Mock, patch
+
+from apps.web import kafka_consumer
+from apps.web.kafka_consumer import IssueTrackerConsumer
+
+
+@pytest.fixture
+def queue_consumer():
+    """Mock queue consumer that subscribes successfully."""
+    consumer = Mock()
+    consumer.subscribe.return_value = True
+    consumer.is_connected.return_value = True
+    return consumer
+
+
+@pytest.fixture
+def firebase_provider():
+    """Mock Firebase provider."""
+    provider = Mock()
+    provider.is_available.return_value = True
+    provider.create_issues_batch.side_effect = lambda issues: [f"issue-{i}" for i in range(len(issues))]
+    return provider
+
+
+@pytest.fixture
+def issue_consumer(queue_consumer, firebase_provider):
+    """IssueTrackerConsumer with injected mocks."""
+    return IssueTrackerConsumer(queue_consumer=queue_consumer, firebase_provider=firebase_provider)
+
+
+def run_one_poll(issue_consumer, messages):
+    """Run the consume loop for a single poll returning the given messages."""
+    def poll(**kwargs):
+        issue_consumer._stop.set()
+        return messages
+    
+    issue_consumer.consumer.poll.side_effect = poll
+    issue_consumer._stop.clear()
+    issue_consumer._consume_loop()
+
+
+class TestConsumeLoop:
+    """Tests for the consumption loop."""
+    
+    def test_idle_poll_does_not_sleep(self, issue_consumer):
+        """Test the loop relies on poll() blocking instead of sleeping between polls."""
+        with patch('apps.web.kafka_consumer.time.sleep') as mock_sleep, \
+                patch.object(issue_consumer._stop, 'wait') as mock_wait:
+            run_one_poll(issue_consumer, [])
+        
+        mock_sleep.assert_not_called()
+        mock_wait.assert_not_called()
+    
+    def test_stop_interrupts_error_backoff(self, issue_consumer, queue_consumer):
+        """Test stopping during the post-error backoff exits the loop without waiting it out."""
+        def poll(**kwargs):
+            issue_consumer.stop()
+            raise RuntimeError("broker unavailable")
+        
+        queue_consumer.poll.side_effect = poll
+        issue_consumer._stop.clear()
+        
+        started = time.monotonic()
+        issue_consumer._consume_loop()
+        
+        assert time.monotonic() - started < 0.5
+        assert not issue_consumer.running
+    
+    def test_poll_batch_written_in_one_call(self, issue_consumer, firebase_provider, queue_consumer):
+        """Test all messages from a poll are written to Firebase in one batch and committed once."""
+        messages = [
+            Mock(value={"title": "Kafka issue", "reporter_id": "service-a"}),
+            Mock(value={"title": "Another issue", "priority": "high"}),
+        ]
+        
+        run_one_poll(issue_consumer, messages)
+        
+        firebase_provider.create_issues_batch.assert_called_once()
+        issues = firebase_provider.create_issues_batch.call_args[0][0]
+        assert [issue.title for issue in issues] == ["Kafka issue", "Another issue"]
+        assert issues[0].reporter_id == "service-a"
+        firebase_provider.create_issue.assert_not_called()
+        queue_consumer.commit.assert_called_once()
+    
+    def test_invalid_message_skipped(self, issue_consumer, firebase_provider):
+        """Test a message with an invalid enum value is dropped without blocking the batch."""
+        messages = [
+            Mock(value={"title": "Bad issue", "priority": "urgent-ish"}),
+            Mock(value={"title": "Good issue"}),
+        ]
+        
+        run_one_poll(issue_consumer, messages)
+        
+        issues = firebase_provider.create_issues_batch.call_args[0][0]
+        assert [issue.title for issue in issues] == ["Good issue"]
+    
+    def test_firebase_availability_probe_cached(self, issue_consumer, firebase_provider):
+        """Test back-to-back batches reuse the Firebase availability result."""
+        messages = [Mock(value={"title": "Kafka issue"})]
+        
+        run_one_poll(issue_consumer, messages)
+        run_one_poll(issue_consumer, messages)
+        
+        firebase_provider.is_available.assert_called_once()
+        assert firebase_provider.create_issues_batch.call_count == 2
+    
+    def test_poll_uses_configured_long_poll(self, queue_consumer, firebase_provider):
+        """Test poll settings are taken from the constructor."""
+        issue_consumer = IssueTrackerConsumer(
+            queue_consumer=queue_consumer,
+            firebase_provider=firebase_provider,
+            poll_timeout_ms=8000,
+            max_records=50
+        )
+        
+        run_one_poll(issue_consumer, [])
+        
+        queue_consumer.poll.assert_called_once_with(timeout_ms=8000, max_records=50)
+
+
+class TestWorkers:
+    """Tests for running several consumer threads."""
+    
+    def test_start_spawns_one_thread_per_worker(self, queue_consumer, firebase_provider):
+        """Test the first worker polls the initial consumer and the rest build their own."""
+        issue_consumer = IssueTrackerConsumer(
+            queue_consumer=queue_consumer,
+            firebase_provider=firebase_provider,
+            num_workers=3
+        )
+        
+        with patch.object(IssueTrackerConsumer, '_consume_loop') as mock_loop, \
+                patch.object(IssueTrackerConsumer, '_run_extra_worker') as mock_extra:
+            issue_consumer.start()
+            issue_consumer.stop()
+        
+        assert len(issue_consumer.threads) == 3
+        mock_loop.assert_called_once_with()
+        assert mock_extra.call_count == 2
+    
+    def test_extra_worker_owns_its_consumer(self, issue_consumer):
+        """Test an extra worker subscribes to the shared group, polls, and closes its own consumer."""
+        worker_consumer = Mock()
+        worker_consumer.subscribe.return_value = True
+        
+        def poll(**kwargs):
+            issue_consumer._stop.set()
+            return [Mock(value={"title": "Worker issue"})]
+        
+        worker_consumer.poll.side_effect = poll
+        queue_factory = Mock()
+        queue_factory.create_queue_consumer.return_value = worker_consumer
+        modules = {
+            'alphafusion': Mock(),
+            'alphafusion.storage': Mock(),
+            'alphafusion.storage.queue_factory': queue_factory,
+        }
+        
+        with patch.dict(sys.modules, modules):
+            issue_consumer._run_extra_worker()
+        
+        worker_consumer.subscribe.assert_called_once_with(
+            [kafka_consumer.ISSUES_TOPIC], group_id=kafka_consumer.CONSUMER_GROUP_ID
+        )
+        worker_consumer.commit.assert_called_once()
+        worker_consumer.close.assert_called_once()
+        issue_consumer.consumer.poll.assert_not_called()
+
+
+class TestGlobalConsumer:
+    """Tests for the module-level consumer singleton."""
+    
+    def test_concurrent_start_creates_one_consumer(self, queue_consumer, firebase_provider):
+        """Test concurrent start_consumer calls share a single consumer."""
+        results = []
+        
+        def start():
+            results.append(kafka_consumer.start_consumer(
+                queue_consumer=queue_consumer,
+                firebase_provider=firebase_provider
+            ))
+        
+        with patch.object(IssueTrackerConsumer, 'start') as mock_start:
+            threads = [threading.Thread(target=start) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            
+            try:
+                assert len({id(consumer) for consumer in results}) == 1
+                mock_start.assert_called_once()
+            finally:
+                kafka_consumer.stop_consumer()
+        
+        assert kafka_consumer.get_consumer() is None
@@ -4,11 +4,11 @@ Unit tests for data models.
 """
 
 import pytest
-from datetime import datetime
+from datetime import datetime, timezone
 from apps.web.models import (
     Issue, Comment, User, Activity, Notification, Attachment,
     IssueStatus, IssuePriority, IssueType, UserRole,
-    ActivityType, NotificationType
+    ActivityType, NotificationType, enum_coercer
 )
 
 
@@ -60,6 +60,16 @@ class TestIssue:
         assert data["type"] == "bug"
         assert data["reporterId"] == "user1"
         assert "createdAt" in data
+        assert "id" not in data
+
+    def test_issue_as_response_dict(self):
+        """Test response dictionary includes the issue ID."""
+        issue = Issue(id="test-123", title="Test Issue", reporter_id="user1")
+
+        data = issue.as_response_dict()
+
+        assert data["id"] == "test-123"
+        assert data["title"] == "Test Issue"
     
     def test_issue_from_dict(self):
         """Test creating issue from dictionary."""
@@ -85,6 +95,39 @@ class TestIssue:
         assert issue.reporter_id == "user1"
         assert issue.assignee_id == "user2"
         assert len(issue.tags) == 2
+        assert issue.created_at == datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    
+    def test_issue_from_dict_passes_datetimes_through(self):
+        """Test datetime values (e.g. Firestore timestamps) are kept as-is."""
+        created_at = datetime(2024, 1, 1, 12, 0)
+        data = {"title": "Test Issue", "createdAt": created_at, "updatedAt": None}
+        
+        issue = Issue.from_dict("test-123", data)
+        
+        assert issue.created_at is created_at
+        assert issue.updated_at is None
+    
+    def test_issue_from_dict_invalid_enum_value(self):
+        """Test unknown enum values are still rejected."""
+        with pytest.raises(ValueError):
+            Issue.from_dict("test-123", {"title": "Test Issue", "status": "archived"})
+
+
+class TestEnumCoercer:
+    """Tests for dict-backed enum coercion."""
+    
+    def test_valid_value(self):
+        """Test values map to the same singleton members as the Enum constructor."""
+        to_status = enum_coercer(IssueStatus)
+        
+        assert to_status("in-progress") is IssueStatus.IN_PROGRESS
+    
+    def test_invalid_value(self):
+        """Test invalid values raise ValueError like the Enum constructor."""
+        to_status = enum_coercer(IssueStatus)
+        
+        with pytest.raises(ValueError):
+            to_status("archived")
 
 
 class TestComment:
@@ -294,3 +337,21 @@ class TestAttachment:
         assert data["name"] == "file.pdf"
         assert data["size"] == 1024
 
+    
+    def test_attachment_from_dict(self):
+        """Test creating attachment from dictionary."""
+        data = {
+            "url": "https://example.com/file.pdf",
+            "name": "file.pdf",
+            "size": 1024,
+            "uploadedAt": "2024-01-01T12:00:00Z"
+        }
+        
+        attachment = Attachment.from_dict(data)
+        
+        assert attachment == Attachment(
+            url="https://example.com/file.pdf",
+            name="file.pdf",
+            size=1024,
+            uploaded_at=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+        )
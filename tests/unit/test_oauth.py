@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Unit tests for OAuth helpers.
+"""
+
+import sys
+import pytest
+from unittest.mock import Mock, MagicMock, patch
+from flask import Flask
+from apps.web import oauth
+from apps.web.oauth import is_quantory_email
+
+
+class TestIsQuantoryEmail:
+    """Tests for the allowed email domain check."""
+    
+    @pytest.mark.parametrize("email", ["dev@quantory.app", "first.last@quantory.app"])
+    def test_allowed_domain(self, email):
+        """Test quantory.app addresses are accepted."""
+        assert is_quantory_email(email) is True
+    
+    @pytest.mark.parametrize("email", ["User@Quantory.App", "dev@QUANTORY.APP"])
+    def test_mixed_case_domain(self, email):
+        """Test the domain is matched case-insensitively."""
+        assert is_quantory_email(email) is True
+    
+    @pytest.mark.parametrize("email", [
+        None,
+        "",
+        "quantory.app",
+        "dev@example.com",
+        "dev@notquantory.app",
+        "dev@quantory.app.example.com",
+    ])
+    def test_other_domains_rejected(self, email):
+        """Test other domains, look-alike domains and empty values are rejected."""
+        assert is_quantory_email(email) is False
+
+
+class TestInitOAuth:
+    """Tests for init_oauth."""
+    
+    @pytest.fixture(autouse=True)
+    def oauth_factory(self):
+        """Stub alphafusion's OAuth factory module and restore the module-level provider afterwards."""
+        factory = MagicMock()
+        modules = {
+            'alphafusion': MagicMock(),
+            'alphafusion.auth': MagicMock(),
+            'alphafusion.auth.oauth_factory': factory,
+        }
+        with patch.dict(sys.modules, modules), patch.object(oauth, '_oauth_provider', None):
+            yield factory
+    
+    def test_provider_per_app(self, oauth_factory):
+        """Test each app gets its own provider rather than a shared one."""
+        oauth_factory.get_default_google_oauth_provider.side_effect = lambda **kwargs: Mock()
+        first_app, second_app = Flask("first"), Flask("second")
+        
+        oauth.init_oauth(first_app)
+        first = oauth._oauth_provider
+        oauth.init_oauth(second_app)
+        
+        assert oauth._oauth_provider is not first
+        first.initialize.assert_called_once_with(first_app)
+        oauth._oauth_provider.initialize.assert_called_once_with(second_app)
+    
+    def test_failed_load_is_retried(self, oauth_factory):
+        """Test a failed load does not stick, so a later app can enable OAuth."""
+        provider = Mock()
+        oauth_factory.get_default_google_oauth_provider.side_effect = [None, provider]
+        
+        oauth.init_oauth(Flask("first"))
+        assert oauth._oauth_provider is None
+        oauth.init_oauth(Flask("second"))
+        assert oauth._oauth_provider is provider
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Unit tests for web UI route helpers.
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import Mock, patch
+from flask import Flask
+from apps.web.models import Issue, IssueStatus, User, UserRole
+from apps.web.routes import register_routes, _get_users_dict, _invalidate_users_cache, _get_issue_counts
+
+
+@pytest.fixture
+def app():
+    """Create a minimal Flask app for helper tests."""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def firebase_provider():
+    """Mock Firebase provider that knows a single user."""
+    provider = Mock()
+    user = User(uid="user1", email="user1@quantory.app", role=UserRole.DEVELOPER)
+    provider.get_users_by_ids.side_effect = lambda uids: {uid: user for uid in uids if uid == "user1"}
+    return provider
+
+
+class TestUsersCache:
+    """Tests for the cached user directory."""
+    
+    def test_only_referenced_users_fetched(self, app, firebase_provider):
+        """Test only the uids shown on the page are read, in one batch."""
+        with app.app_context():
+            users = _get_users_dict(firebase_provider, {"user1", "ghost", None})
+        
+        assert list(users) == ["user1"]
+        firebase_provider.get_users_by_ids.assert_called_once()
+        assert sorted(firebase_provider.get_users_by_ids.call_args[0][0]) == ["ghost", "user1"]
+        firebase_provider.list_users.assert_not_called()
+    
+    def test_users_cached_within_ttl(self, app, firebase_provider):
+        """Test repeated page views reuse cached users and misses."""
+        with app.app_context():
+            first = _get_users_dict(firebase_provider, ["user1", "ghost"])
+            second = _get_users_dict(firebase_provider, ["user1", "ghost"])
+        
+        assert first == second
+        firebase_provider.get_users_by_ids.assert_called_once()
+    
+    def test_users_reloaded_after_ttl(self, app, firebase_provider):
+        """Test users are re-read once the TTL has passed."""
+        with app.app_context():
+            with patch('apps.web.routes.time.monotonic', side_effect=[100.0, 1000.0]):
+                _get_users_dict(firebase_provider, ["user1"])
+                _get_users_dict(firebase_provider, ["user1"])
+        
+        assert firebase_provider.get_users_by_ids.call_count == 2
+    
+    def test_invalidate_forces_reload(self, app, firebase_provider):
+        """Test invalidation (after user create/update) forces a fresh read."""
+        with app.app_context():
+            _get_users_dict(firebase_provider, ["user1"])
+            _invalidate_users_cache()
+            _get_users_dict(firebase_provider, ["user1"])
+        
+        assert firebase_provider.get_users_by_ids.call_count == 2
+
+
+class TestIssueCountsCache:
+    """Tests for the cached dashboard counts."""
+    
+    def test_counts_reused_within_ttl(self, app, firebase_provider):
+        """Test dashboard views within the TTL share one set of count queries."""
+        firebase_provider.count_issues_by_status.return_value = {"total": 1, "open": 1}
+        
+        with app.app_context():
+            _get_issue_counts(firebase_provider)
+            counts = _get_issue_counts(firebase_provider)
+        
+        assert counts == {"total": 1, "open": 1}
+        firebase_provider.count_issues_by_status.assert_called_once_with()
+    
+    def test_failed_counts_not_cached(self, app, firebase_provider):
+        """Test an empty (failed) count result is retried on the next view."""
+        firebase_provider.count_issues_by_status.return_value = {}
+        
+        with app.app_context():
+            _get_issue_counts(firebase_provider)
+            _get_issue_counts(firebase_provider)
+        
+        assert firebase_provider.count_issues_by_status.call_count == 2
+
+
+class TestDashboard:
+    """Tests for the dashboard view."""
+    
+    @patch('apps.web.routes.render_template', return_value="dashboard")
+    def test_dashboard_stats_and_recent_issues(self, mock_render, app, firebase_provider):
+        """Test stats come from count aggregations and only the 10 newest issues are fetched."""
+        firebase_provider.count_issues_by_status.return_value = {
+            "total": 12, "open": 3, "in-progress": 0, "resolved": 8, "closed": 1
+        }
+        firebase_provider.list_issues.return_value = [
+            Issue(id=f"issue-{i}", title=f"Issue {i}", status=IssueStatus.OPEN, created_at=datetime(2024, 1, 10 - i))
+            for i in range(10)
+        ]
+        app.secret_key = "test-secret"
+        app.firebase_helper_provider = firebase_provider
+        register_routes(app)
+        
+        with app.test_client() as client:
+            with client.session_transaction() as sess:
+                sess["user_id"] = "user1@quantory.app"
+            response = client.get("/dashboard")
+        
+        assert response.status_code == 200
+        firebase_provider.list_issues.assert_called_once_with(limit=10)
+        kwargs = mock_render.call_args.kwargs
+        assert kwargs["stats"] == {"total": 12, "open": 3, "in_progress": 0, "resolved": 8, "closed": 1}
+        assert [issue.id for issue in kwargs["recent_issues"]] == [f"issue-{i}" for i in range(10)]
+
+
+class TestUpdateIssue:
+    """Tests for the web issue update view."""
+    
+    @pytest.fixture
+    def client(self, app, firebase_provider):
+        """Test client for an app with the web routes registered and a logged-in user."""
+        app.secret_key = "test-secret"
+        app.firebase_helper_provider = firebase_provider
+        register_routes(app)
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess["user_id"] = "user1@quantory.app"
+        return client
+    
+    def test_update_issue_single_read(self, client, firebase_provider):
+        """Test the view does not fetch the issue before update_issue reads it."""
+        firebase_provider.update_issue.return_value = True
+        
+        response = client.post("/issues/test-123/update", data={"status": "resolved"})
+        
+        assert response.status_code == 302
+        assert response.headers["Location"].endswith("/issues/test-123")
+        firebase_provider.get_issue.assert_not_called()
+        firebase_provider.update_issue.assert_called_once_with(
+            "test-123", {"status": IssueStatus.RESOLVED}, "user1@quantory.app"
+        )
+
+
+class TestIssueDetail:
+    """Tests for the issue detail view."""
+    
+    @patch('apps.web.routes.render_template', return_value="issue")
+    def test_issue_detail_reads_issue_comments_and_activities(self, mock_render, app, firebase_provider):
+        """Test the detail page renders the issue with its comments, activities and users."""
+        firebase_provider.get_issue.return_value = Issue(id="test-123", title="Test Issue", reporter_id="user1")
+        firebase_provider.get_comments.return_value = []
+        firebase_provider.get_activities.return_value = []
+        app.secret_key = "test-secret"
+        app.firebase_helper_provider = firebase_provider
+        register_routes(app)
+        
+        with app.test_client() as client:
+            with client.session_transaction() as sess:
+                sess["user_id"] = "user1@quantory.app"
+            response = client.get("/issues/test-123")
+        
+        assert response.status_code == 200
+        firebase_provider.get_comments.assert_called_once_with("test-123")
+        firebase_provider.get_activities.assert_called_once_with("test-123")
+        kwargs = mock_render.call_args.kwargs
+        assert kwargs["issue"].id == "test-123"
+        assert list(kwargs["users"]) == ["user1"]
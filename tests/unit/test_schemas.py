@@ -8,7 +8,7 @@ from marshmallow import ValidationError
 from apps.web.schemas import (
     IssueCreateSchema, IssueUpdateSchema, CommentCreateSchema,
     IssueQuerySchema, IssuePathSchema, UserCreateSchema,
-    validate_json_body, validate_path_params, validate_query_params
+    validate_json_body, validate_path_params, validate_query_params, get_schema
 )
 
 
@@ -201,7 +201,12 @@ class TestValidationHelpers:
         
         with pytest.raises(ValueError):
             validate_path_params(IssuePathSchema, data)
-    
+
+    def test_schema_instances_are_reused(self):
+        """Test validators reuse a single schema instance per class."""
+        assert get_schema(IssuePathSchema) is get_schema(IssuePathSchema)
+        assert get_schema(IssuePathSchema) is not get_schema(IssueQuerySchema)
+
     def test_validate_query_params_success(self):
         """Test successful query parameter validation."""
         data = {